@@ -0,0 +1,111 @@
+# gunicorn.conf.py
+# Production serving profile (Procfile: gunicorn -c gunicorn.conf.py server:app).
+# Every setting can be overridden from the environment; defaults are sized
+# from the CPU count and the memory available to the container.
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def _env_bool(name, default):
+    return os.environ.get(name, "1" if default else "0") in ("1", "true", "True")
+
+def _available_memory_mb():
+    """cgroup limit if we're in a container, else MemAvailable; None if unknown."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+            if raw.isdigit() and int(raw) < (1 << 60):
+                return int(raw) // (1024 * 1024)
+        except OSError:
+            pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+# ----------------------------
+# Sizing
+# ----------------------------
+# A worker holds the corpus languages it has served (~10-25 MB each once
+# parsed), so memory rather than CPU usually caps the worker count.
+CPU_COUNT = multiprocessing.cpu_count()
+WORKER_MEMORY_MB = _env_int("WORKER_MEMORY_MB", 256)
+
+# On one core extra processes only contend for it (and each holds its own copy
+# of the corpus), so a single worker is used there.
+WORKERS_BY_CPU = 1 if CPU_COUNT == 1 else 2 * CPU_COUNT + 1
+THREADS_PER_WORKER = 4
+
+def _default_workers():
+    mem = _available_memory_mb()
+    by_mem = max(1, mem // WORKER_MEMORY_MB) if mem else WORKERS_BY_CPU
+    return max(1, min(WORKERS_BY_CPU, by_mem))
+
+def _default_threads(n_workers):
+    # When memory caps the worker count, the missing workers' share of
+    # concurrency goes to threads in the ones we have.
+    short = -(-WORKERS_BY_CPU // max(1, n_workers))   # ceil
+    return min(16, THREADS_PER_WORKER * short)
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '5050')}")
+workers = _env_int("WEB_CONCURRENCY", _default_workers())
+
+# gthread: reading routes are mostly I/O (file reads, SMTP, SQLite), so a few
+# threads per worker keep a slow SMTP call or PBKDF2 check from stalling every
+# reader; CPU-bound work still spreads across processes.
+worker_class = os.environ.get("WORKER_CLASS", "gthread")
+threads = _env_int("WEB_THREADS", _default_threads(workers))
+os.environ.setdefault("WEB_THREADS", str(threads))   # server.py sizes its DB pool from this
+
+# ----------------------------
+# Recycling & timeouts
+# ----------------------------
+# Recycle workers to bound cache/heap growth; jitter avoids restarting them all at once.
+max_requests = _env_int("MAX_REQUESTS", 5000)
+max_requests_jitter = _env_int("MAX_REQUESTS_JITTER", 500)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)              # a cold language load is well under this
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# Preloading imports the app once in the master (faster boot, shared pages for
+# the book names and metadata index); workers then need fresh DB connections
+# after the fork.
+preload_app = _env_bool("GUNICORN_PRELOAD", False)
+
+def on_starting(server):
+    # With preload, warm the corpus once in the master before any worker exists: every
+    # worker forks warm, so /readyz (served by whichever worker accepts the probe) is
+    # accurate for the whole instance. Without preload each worker warms itself.
+    if preload_app:
+        from server import _WARMUP
+        _WARMUP.run_now()
+
+def post_fork(server, worker):
+    if preload_app:
+        from server import app, db
+        with app.app_context():
+            db.engine.dispose()
+
+def post_worker_init(worker):
+    # Start loading the priority languages right away; /readyz turns 200 once they are warm
+    # (already true when the master warmed up under preload_app).
+    from server import _WARMUP
+    _WARMUP.start()
+
+def when_ready(server):
+    server.log.info(
+        "serving profile: %s workers x %s threads (%s), max_requests=%s, timeout=%ss, preload=%s",
+        workers, threads, worker_class, max_requests, timeout, preload_app,
+    )
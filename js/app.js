@@ -39,6 +39,7 @@ async function renderBooksPage() {
 
   // Fetch localized book names (silent fallback to slugs)
   let localized = {};
+  let indexedChapterWord = "";
   try {
     const resp = await fetch(`/api/books?lang=${encodeURIComponent(main)}`, { cache: "no-store" });
     if (resp.ok) {
@@ -48,26 +49,41 @@ async function renderBooksPage() {
           if (b && b.abbr) localized[b.abbr] = (b.name || "").trim();
         }
       }
+      indexedChapterWord = (data?.chapterWord || "").toString().trim();
     }
   } catch (_) { /* silent fallback */ }
 
   // Chapter label from booksnames.json (silent fallback to "Chapter")
   let chapterWord = "Chapter";
   try {
-    const res = await fetch("/booksnames.json", { cache: "no-store" });
-    if (res.ok) {
-      const all = await res.json();
-      const ch = all?.[main]?.chapter?.toString().trim();
-      const looksLikeWord =
-        /[A-Za-z\u00C0-\u024F\u0370-\u03FF\u0400-\u04FF\u0590-\u06FF\u0900-\u097F]/.test(ch || "") ||
-        /[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7AF]/.test(ch || "");
-      if (ch && looksLikeWord) chapterWord = ch;
+    // /api/books already carries the label; only fetch booksnames.json if it didn't
+    let ch = indexedChapterWord;
+    if (!ch) {
+      const res = await fetch("/booksnames.json", { cache: "no-store" });
+      if (res.ok) {
+        const all = await res.json();
+        ch = all?.[main]?.chapter?.toString().trim();
+      }
     }
+    const looksLikeWord =
+      /[A-Za-z\u00C0-\u024F\u0370-\u03FF\u0400-\u04FF\u0590-\u06FF\u0900-\u097F]/.test(ch || "") ||
+      /[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7AF]/.test(ch || "");
+    if (ch && looksLikeWord) chapterWord = ch;
   } catch (_) { /* silent fallback */ }
 
   const isCJK = /[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7AF]/.test(chapterWord);
   const makeChapterLabel = (n) => (isCJK ? `${n}${chapterWord}` : `${chapterWord} ${n}`);
 
+  // Per-chapter availability ("full" | "partial" | "none") for both columns (silent: treat as full)
+  const getAvailability = async (lang) => {
+    try {
+      const resp = await fetch(`/api/availability?lang=${encodeURIComponent(lang)}`);
+      return resp.ok ? ((await resp.json())?.books || {}) : {};
+    } catch (_) { return {}; }
+  };
+  const [mainAvail, secondAvail] = await Promise.all([getAvailability(main), getAvailability(second)]);
+  const chapterStatus = (avail, abbr, i) => avail?.[abbr]?.chapters?.[i - 1] || "full";
+
   // ---------- helpers ----------
   const mkEl = (tag, cls, text) => {
     const el = document.createElement(tag);
@@ -118,10 +134,23 @@ async function renderBooksPage() {
     const ul = mkEl("ul", "chapter-list");
     for (let i = 1; i <= meta.chapters; i++) {
       const li = document.createElement("li");
-      const a = document.createElement("a");
-      a.href = `chapter.html?book=${meta.abbr}&chapter=${i}&main=${encodeURIComponent(main)}&second=${encodeURIComponent(second)}`;
-      a.textContent = makeChapterLabel(i);
-      li.appendChild(a);
+      const mainStatus = chapterStatus(mainAvail, meta.abbr, i);
+      const secondStatus = chapterStatus(secondAvail, meta.abbr, i);
+      if (mainStatus === "none" && secondStatus === "none") {
+        // Neither column has text: grey it out instead of linking to a 404
+        const span = mkEl("span", "ch-missing", makeChapterLabel(i));
+        span.title = "Not available in either language";
+        li.appendChild(span);
+      } else {
+        const a = document.createElement("a");
+        a.href = `chapter.html?book=${meta.abbr}&chapter=${i}&main=${encodeURIComponent(main)}&second=${encodeURIComponent(second)}`;
+        a.textContent = makeChapterLabel(i);
+        if (mainStatus !== "full" || secondStatus !== "full") {
+          a.className = "ch-partial";
+          a.title = `${main.toUpperCase()}: ${mainStatus}, ${second.toUpperCase()}: ${secondStatus}`;
+        }
+        li.appendChild(a);
+      }
       ul.appendChild(li);
     }
     book.panel.appendChild(ul);
@@ -189,6 +218,7 @@ async function loadChapter() {
 
   // Localized book names for header (silent fallback to slug)
   let localized = {};
+  let indexedChapterWord = "";
   try {
     const resp = await fetch(`/api/books?lang=${encodeURIComponent(main)}`, { cache: "no-store" });
     if (resp.ok) {
@@ -198,21 +228,26 @@ async function loadChapter() {
           if (b && b.abbr) localized[b.abbr] = (b.name || "").trim();
         }
       }
+      indexedChapterWord = (data?.chapterWord || "").toString().trim();
     }
   } catch (_) { /* silent fallback */ }
 
   // Chapter label for header (localized; silent fallback)
   let chapterWord = "Chapter";
   try {
-    const res = await fetch("/booksnames.json", { cache: "no-store" });
-    if (res.ok) {
-      const all = await res.json();
-      const ch = all?.[main]?.chapter?.toString().trim();
-      const looksLikeWord =
-        /[A-Za-z\u00C0-\u024F\u0370-\u03FF\u0400-\u04FF\u0590-\u06FF\u0900-\u097F]/.test(ch || "") ||
-        /[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7AF]/.test(ch || "");
-      if (ch && looksLikeWord) chapterWord = ch;
+    // /api/books already carries the label; only fetch booksnames.json if it didn't
+    let ch = indexedChapterWord;
+    if (!ch) {
+      const res = await fetch("/booksnames.json", { cache: "no-store" });
+      if (res.ok) {
+        const all = await res.json();
+        ch = all?.[main]?.chapter?.toString().trim();
+      }
     }
+    const looksLikeWord =
+      /[A-Za-z\u00C0-\u024F\u0370-\u03FF\u0400-\u04FF\u0590-\u06FF\u0900-\u097F]/.test(ch || "") ||
+      /[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7AF]/.test(ch || "");
+    if (ch && looksLikeWord) chapterWord = ch;
   } catch (_) { /* silent fallback */ }
 
   const isCJK = /[\u4E00-\u9FFF\u3040-\u30FF\uAC00-\uD7AF]/.test(chapterWord);
@@ -290,6 +325,12 @@ async function loadChapter() {
   const getVersesViaProxy = async (lang) => {
     const url = `/api/chapter?book=${encodeURIComponent(book)}&chapter=${encodeURIComponent(chapter)}&lang=${encodeURIComponent(lang)}`;
     const resp = await fetch(url);
+    if (resp.status === 404) {
+      // partial language: the chapter is a known gap, so this column just stays empty
+      const data = await resp.json().catch(() => ({}));
+      if (data.status === "none") return [];
+      throw new Error(data.error || `Proxy error: ${resp.status}`);
+    }
     if (!resp.ok) throw new Error(`Proxy error: ${resp.status}`);
     const data = await resp.json();
     return data.verses || [];
@@ -335,15 +376,36 @@ async function loadChapter() {
     } catch (_) { /* silent: meta rows are optional */ }
   }
 
-  // Render verses
-  const maxLen = Math.max(mainVerses.length, secondVerses.length);
-  for (let i = 0; i < maxLen; i++) {
+  if (!mainVerses.length && !secondVerses.length) {
+    const div = document.createElement("div");
+    div.className = "verse-row error";
+    div.textContent = "This chapter is not available in either language.";
+    container.appendChild(div);
+    return;
+  }
+
+  // Render verses, aligned by verse number so a gap in one language doesn't shift the other column.
+  // Keys may use native digits ("๑", "1.", "፩"); "n" is the server's numeric verse (0 = unnumbered text).
+  const verseNum = (v) => (typeof v === "object" && v ? (v.n ?? (parseInt(v.verse, 10) || 0)) : 0);
+  const byNum = (list) => {
+    const m = new Map();
+    for (const v of list) {
+      const n = verseNum(v);
+      m.set(n, m.has(n) ? [].concat(m.get(n), v) : v);
+    }
+    return m;
+  };
+  const mainByNum = byNum(mainVerses);
+  const secondByNum = byNum(secondVerses);
+  const numbers = [...new Set([...mainByNum.keys(), ...secondByNum.keys()])].sort((a, b) => a - b);
+  for (const n of numbers) {
     const row = document.createElement("div");
     row.className = "verse-row";
 
     // Helper to format: "1 And it came to pass..."
     const formatVerse = (vObj) => {
       if (!vObj) return "";
+      if (Array.isArray(vObj)) return vObj.map(formatVerse).join(" ");
       // Handle new object format { verse: "1", text: "..." }
       if (typeof vObj === 'object' && vObj.text) {
         return `<span class="v-num"><b>${vObj.verse}</b></span> ${vObj.text}`;
@@ -353,12 +415,12 @@ async function loadChapter() {
     };
 
     const col1 = document.createElement("div");
-    col1.className = "verse-col";
-    col1.innerHTML = formatVerse(mainVerses[i]);
+    col1.className = mainByNum.has(n) ? "verse-col" : "verse-col verse-gap";
+    col1.innerHTML = formatVerse(mainByNum.get(n));
 
     const col2 = document.createElement("div");
-    col2.className = "verse-col";
-    col2.innerHTML = formatVerse(secondVerses[i]);
+    col2.className = secondByNum.has(n) ? "verse-col" : "verse-col verse-gap";
+    col2.innerHTML = formatVerse(secondByNum.get(n));
     row.appendChild(col1);
     row.appendChild(col2);
 
@@ -366,6 +428,17 @@ async function loadChapter() {
   }
   // Force default Single view AFTER verses render
   if (window.__enterSingleView) window.__enterSingleView();
+
+  // Warm the browser cache for the next page turn (same URLs getVersesViaProxy will request)
+  const prefetch = (href) => {
+    const link = document.createElement("link");
+    link.rel = "prefetch";
+    link.href = href;
+    document.head.appendChild(link);
+  };
+  for (const lang of [main, second]) {
+    prefetch(`/api/chapter?book=${encodeURIComponent(nextBookAbbr)}&chapter=${encodeURIComponent(nextChapterNum)}&lang=${encodeURIComponent(lang)}`);
+  }
 }
 
 // Router-ish init
@@ -1,12 +1,25 @@
 # server.py
-from flask import Flask, request, jsonify, send_from_directory, render_template, redirect, url_for, session, g
+from flask import Flask, request, jsonify, send_from_directory, send_file, render_template, redirect, url_for, session, g, Response, stream_with_context, has_request_context
 import os
 import re
 import time
 import json
-from datetime import datetime
+import sys
+import hashlib
+import threading
+import zlib
+import atexit
+import unicodedata
+import base64
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import quote
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import sqlite3
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 import smtplib, ssl
 
@@ -31,31 +44,100 @@ BOOK_CHAPTERS = {
 # ----------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 BOOKSNAMES_PATH = os.path.join(BASE_DIR, "booksnames.json")
+DERIVED_DIR = os.path.join(BASE_DIR, "derived")   # outputs of the offline jobs in tools/
 
-try:
-    with open(BOOKSNAMES_PATH, "r", encoding="utf-8") as f:
-        BOOKS_NAMES = json.load(f)   # { "<lang>": { "<slug>": "<Localized Title>", ... }, ... }
-except Exception:
-    BOOKS_NAMES = {}                 # graceful if file missing/corrupt
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _read_booksnames():
+    try:
+        return _read_json(BOOKSNAMES_PATH)   # { "<lang>": { "<slug>": "<Localized Title>", ... }, ... }
+    except Exception:
+        return {}                 # graceful if file missing/corrupt
+
+# Book names, chapter/verse counts and availability for every language, built by
+# tools/build_metadata_index.py so /api/books never has to parse verse text.
+METADATA_INDEX_PATH = os.path.join(BASE_DIR, "metadata_index.json")
+
+def _read_metadata_index():
+    try:
+        return _read_json(METADATA_INDEX_PATH).get("languages", {})   # { "<lang>": { "books": [...], ... }, ... }
+    except Exception:
+        return {}                 # graceful if not built yet
+
+# One bitmap per language over the global verse space (also built by
+# tools/build_metadata_index.py; layout documented there), so a missing or
+# partial chapter is known without loading the language.
+AVAILABILITY_PATH = os.path.join(BASE_DIR, "verse_availability.json")
+
+class _Availability:
+    def __init__(self, raw: dict):
+        self.slots = {}   # { (slug, chapter): (first slot, slot count) }
+        pos = 0
+        chapters = raw.get("space", {}).get("chapters", {})
+        for slug in BOOK_SLUGS:
+            for n, top in enumerate(chapters.get(slug, []), 1):
+                self.slots[(slug, n)] = (pos, top + 1)
+                pos += top + 1
+        bitmaps = {bid: int.from_bytes(base64.b64decode(b64), "little") for bid, b64 in raw.get("bitmaps", {}).items()}
+        # { lang: (bitmap as an int, corpus file size it was built from) }; equal bitmaps share one int
+        self.langs = {lang: (bitmaps.get(e.get("bitmap"), 0), e.get("size"))
+                      for lang, e in raw.get("languages", {}).items()}
+
+    def chapter_bits(self, bits: int, book: str, chapter: int):
+        """(present slots as an int, slot count); bit 0 is unnumbered chapter text, bit v is verse v."""
+        start, count = self.slots[(book, chapter)]
+        return (bits >> start) & ((1 << count) - 1), count
+
+    def chapter_status(self, bits: int, book: str, chapter: int) -> str:
+        present, count = self.chapter_bits(bits, book, chapter)
+        if not present:
+            return "none"
+        return "full" if present >> 1 == (1 << (count - 1)) - 1 else "partial"
+
+    def chapter_verses(self, bits: int, book: str, chapter: int):
+        present, count = self.chapter_bits(bits, book, chapter)
+        return [v for v in range(count) if present >> v & 1]
+
+def _read_availability():
+    try:
+        return _Availability(_read_json(AVAILABILITY_PATH))
+    except Exception:
+        return _Availability({})  # graceful if not built yet
 
 
 # ----------------------------
 # /api/books — now served from booksnames.json (with fallback)
 # ----------------------------
-_BOOKS_CACHE = {}   # { lang: { "at": epoch_seconds, "data": [...] } }
-_CACHE_TTL   = 60 * 60 * 24  # 24h
+_BOOKS_CACHE = {}   # { lang: { "version": corpus version, "data": [...] } }
 
 def _get_books_for_lang(lang: str):
-    now = time.time()
+    corpus = _corpus()
     hit = _BOOKS_CACHE.get(lang)
-    if hit and (now - hit["at"] < _CACHE_TTL):
+    if hit and hit["version"] == corpus.version:
         return hit["data"]
 
     out = []
 
-    # 1. Try to load authoritative names from the downloaded JSON file first
+    # 1. Precomputed metadata index (no verse text loaded)
+    indexed = corpus.index.get(lang)
+    if indexed:
+        books = _book_availability(lang) or {}
+        out = [{
+            "abbr": b["abbr"],
+            "name": b["name"],
+            "chapters": b["chapters"],
+            "chaptersAvailable": b["chaptersAvailable"],
+            "verses": b["verses"],
+            "status": books.get(b["abbr"], {}).get("status") or _count_status(b["chaptersAvailable"], b["chapters"]),
+        } for b in indexed["books"]]
+        _BOOKS_CACHE[lang] = {"version": corpus.version, "data": out}
+        return out
+
+    # 2. Try to load authoritative names from the downloaded JSON file
     file_data = _load_book_data(lang)
-    if file_data:
+    if file_data and _has_verses(file_data):
         for slug in BOOK_SLUGS:
             # Safe get in case a book is missing from the file
             book_meta = file_data.get(slug, {}).get("meta", {})
@@ -67,43 +149,266 @@ def _get_books_for_lang(lang: str):
                 "chapters": BOOK_CHAPTERS.get(slug, 0),
             })
     else:
-       # 2. Fallback to booksnames.json or raw slugs
-       names = BOOKS_NAMES.get(lang, {}) 
+       # 3. Fallback to booksnames.json or raw slugs
+       names = corpus.names.get(lang, {})
        for slug in BOOK_SLUGS:
            out.append({
                "abbr": slug,
                "name": names.get(slug, slug.replace("-", " ").title()),
                "chapters": BOOK_CHAPTERS[slug],
             })
-    _BOOKS_CACHE[lang] = {"at": now, "data": out}
+    _BOOKS_CACHE[lang] = {"version": corpus.version, "data": out}
     return out
 # ----------------------------
 # Local File Loader
 # ----------------------------
-_FILE_CACHE = {}
- 
+class _Corpus:
+    """
+    One version of the corpus. The watcher (see "Corpus hot reload" below)
+    builds a new one off to the side and swaps _CORPUS; requests pin the
+    version they started on, so a swap never mixes old and new data.
+    """
+    __slots__ = ("version", "names", "index", "files", "digests", "contents", "stamps", "resolver", "availability")
+
+    def __init__(self, version, names, index, files=None, digests=None, contents=None, stamps=None):
+        self.version = version
+        self.names = names                # booksnames.json
+        self.index = index                # metadata_index.json "languages"
+        self.files = files or {}          # { lang: data }; byte-identical files share one object
+        self.digests = digests or {}      # { lang: sha1 of file bytes }
+        self.contents = contents or {}    # { sha1 of file bytes: data }
+        self.stamps = stamps or {}        # { path: (mtime_ns, size) } of every file this version has read
+        self.resolver = None              # _BookResolver over names + index
+        self.availability = None          # _Availability from verse_availability.json
+
+def _file_stamp(path: str):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+_CORPUS = _Corpus(1, _read_booksnames(), _read_metadata_index(),
+                  stamps={p: _file_stamp(p) for p in (BOOKSNAMES_PATH, METADATA_INDEX_PATH, AVAILABILITY_PATH)})
+_CORPUS.availability = _read_availability()
+
+def _corpus() -> _Corpus:
+    """The corpus version this request started on (pinned in g), or the current one outside requests."""
+    if not has_request_context():
+        return _CORPUS
+    corpus = g.get("_corpus")
+    if corpus is None:
+        corpus = g._corpus = _CORPUS
+    return corpus
+
+# Stub languages (files with no verses, e.g. ben/kaz/efi/sot) are served from the
+# first language in their chain that has text: LANG_FALLBACKS="ben:eng,kaz:rus:eng".
+# Anything not listed falls back to DEFAULT_FALLBACK_LANG.
+DEFAULT_FALLBACK_LANG = os.environ.get("DEFAULT_FALLBACK_LANG", "eng")
+LANG_FALLBACKS = {
+    chain.split(":")[0]: chain.split(":")[1:]
+    for chain in os.environ.get("LANG_FALLBACKS", "").split(",") if ":" in chain
+}
+
+def _clean_lang(lang: str) -> str:
+    # Sanitize input to prevent directory traversal
+    return re.sub(r'[^a-zA-Z0-9-]', '', lang or "")
+
+def _intern_strings(data):
+    """Interns names, verse keys and verse texts so text repeated across languages is stored once."""
+    for book in data.values():
+        meta = book.get("meta")
+        if meta:
+            book["meta"] = {sys.intern(k): sys.intern(v) if isinstance(v, str) else v for k, v in meta.items()}
+        chapters = book.get("chapters", {})
+        for n, content in chapters.items():
+            chapters[n] = {sys.intern(k): sys.intern(v) if isinstance(v, str) else v for k, v in content.items()}
+    return data
+
+def _has_verses(data) -> bool:
+    return any(
+        k != "intro"
+        for book in data.values()
+        for content in book.get("chapters", {}).values()
+        for k in content
+    )
+
+def _parse_book_file(raw: bytes, contents: dict):
+    """(sha1, data) for a language file's bytes; byte-identical files (e.g. zho/yue) share one parsed object."""
+    digest = hashlib.sha1(raw).hexdigest()
+    data = contents.get(digest)
+    if data is None:
+        data = _intern_strings(json.loads(raw.decode('utf-8')))
+    return digest, data
+
+# Single-flight loading: under threaded workers a burst of requests for an
+# uncached language would otherwise run N json.loads of the same multi-MB
+# file at once. The first caller reads the file; the others wait for its
+# result. Missing or unparsable files are remembered for LOAD_FAILURE_TTL
+# seconds (or until the watcher sees the file change).
+LOAD_FAILURE_TTL = float(os.environ.get("LOAD_FAILURE_TTL", "30"))
+_LOAD_FAILURES_MAX = 1024
+_LOAD_LOCK = threading.Lock()
+_INFLIGHT = {}        # { (corpus version, lang): _Flight }
+_LOAD_FAILURES = {}   # { lang: (monotonic expiry, reason) }
+_LOAD_STATS = {"loads": 0, "coalesced": 0, "failures": 0, "failure_hits": 0}
+
+class _Flight:
+    __slots__ = ("done", "data")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None
+
+def _read_book_file(corpus, lang: str):
+    """Reads and parses all_books/{lang}.json into `corpus`; raises if missing or corrupt."""
+    # Sanitize input to prevent directory traversal
+    file_path = os.path.join(BASE_DIR, "all_books", f"{_clean_lang(lang)}.json")
+    with open(file_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        raw = f.read()
+    corpus.stamps[file_path] = (st.st_mtime_ns, st.st_size)   # even if corrupt: the watcher retries it once fixed
+    # Byte-identical files share one parsed object
+    digest, data = _parse_book_file(raw, corpus.contents)
+    corpus.contents[digest] = data
+    corpus.digests[lang] = digest
+    corpus.files[lang] = data
+    return data
+
 def _load_book_data(lang: str):
     """Loads the entire JSON content for a language from all_books/{lang}.json"""
+    # Everything below is keyed by the cleaned code, the one the watcher derives from the
+    # file name: an alias like "eng " would otherwise keep serving the old text after a reload.
+    lang = _clean_lang(lang)
     # 1. Check cache first
-    if lang in _FILE_CACHE:
-        return _FILE_CACHE[lang]
+    corpus = _corpus()
+    data = corpus.files.get(lang)
+    if data is not None:
+        return data
 
-    # 2. Sanitize input to prevent directory traversal
-    clean_lang = re.sub(r'[^a-zA-Z0-9-]', '', lang)
-    file_path = os.path.join(BASE_DIR, "all_books", f"{clean_lang}.json")
-    
-    # 3. Read file if exists
-    if not os.path.exists(file_path):
-        return None
-        
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            _FILE_CACHE[lang] = data
+    # 2. Join a load already in flight, or become the one that reads the file
+    key = (corpus.version, lang)
+    with _LOAD_LOCK:
+        data = corpus.files.get(lang)
+        if data is not None:
             return data
+        failed = _LOAD_FAILURES.get(lang)
+        if failed and failed[0] > time.monotonic():
+            _LOAD_STATS["failure_hits"] += 1
+            return None
+        flight = _INFLIGHT.get(key)
+        leader = flight is None
+        if leader:
+            flight = _INFLIGHT[key] = _Flight()
+            _LOAD_STATS["loads"] += 1
+        else:
+            _LOAD_STATS["coalesced"] += 1
+    if not leader:
+        flight.done.wait()
+        return flight.data
+
+    # 3. Read the file (outside the lock: other languages load in parallel)
+    reason = None
+    try:
+        flight.data = _read_book_file(corpus, lang)
+    except FileNotFoundError:
+        reason = "missing"
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
+        reason = f"unreadable: {e}"
+        app.logger.error("Error reading all_books/%s.json: %s", lang, e)
+    finally:
+        with _LOAD_LOCK:
+            _INFLIGHT.pop(key, None)
+            if flight.data is None:
+                _LOAD_STATS["failures"] += 1
+                if len(_LOAD_FAILURES) >= _LOAD_FAILURES_MAX:
+                    now = time.monotonic()
+                    for stale in [l for l, (exp, _r) in _LOAD_FAILURES.items() if exp <= now] or list(_LOAD_FAILURES):
+                        del _LOAD_FAILURES[stale]
+                _LOAD_FAILURES[lang] = (time.monotonic() + LOAD_FAILURE_TTL, reason or "error")
+        flight.done.set()
+    return flight.data
+
+def _loader_stats():
+    with _LOAD_LOCK:
+        now = time.monotonic()
+        return dict(_LOAD_STATS, inflight=len(_INFLIGHT),
+                    failing={l: r for l, (exp, r) in _LOAD_FAILURES.items() if exp > now})
+
+# Keep in sync with verse_number() in tools/build_metadata_index.py.
+_ETHIOPIC = {chr(0x1369 + i): i + 1 for i in range(9)}             # ፩..፱
+_ETHIOPIC.update({chr(0x1372 + i): (i + 1) * 10 for i in range(9)})  # ፲..፺
+
+def _verse_number(key: str):
+    """Verse keys come as "12", "12.", native digits ("١٢", "๑๒") or Ethiopic numerals ("፲፪")."""
+    key = key.strip().rstrip(".")
+    if key.isdecimal():
+        return int(key)   # int() reads any Unicode decimal digits
+    if key and all(ch in _ETHIOPIC or ch == "\u137b" for ch in key):
+        if "\u137b" not in key:                                    # ፻ = 100
+            return sum(_ETHIOPIC[ch] for ch in key)
+        hundreds, _, rest = key.partition("\u137b")
+        return 100 * (sum(_ETHIOPIC[ch] for ch in hundreds) or 1) + sum(_ETHIOPIC[ch] for ch in rest)
+    return None
+
+def _numbered_verses(chapter_content) -> dict:
+    """{ verse number: text } for a chapter's non-empty numbered verses, whatever the key style."""
+    out = {}
+    for key, text in (chapter_content or {}).items():
+        n = _verse_number(key) if key != "intro" else None
+        if n and text:
+            out[n] = text
+    return out
+
+def _availability_bits(lang: str):
+    """The language's verse bitmap, or None if there is none or its file changed since it was built."""
+    corpus = _corpus()
+    entry = corpus.availability.langs.get(lang)
+    if entry is None:
         return None
+    path = os.path.join(BASE_DIR, "all_books", f"{_clean_lang(lang)}.json")
+    stamp = corpus.stamps.get(path)
+    if stamp is None:
+        stamp = _file_stamp(path)
+        if stamp is not None:
+            corpus.stamps[path] = stamp
+    return entry[0] if stamp and stamp[1] == entry[1] else None
+
+def _chapter_availability(lang: str, book: str, chapter):
+    """"full" / "partial" / "none" for one chapter, or None when unknown (no bitmap, stub language, bad params)."""
+    bits = _availability_bits(lang)
+    chapter = str(chapter)
+    if not bits or book not in BOOK_CHAPTERS or not chapter.isdigit() \
+            or not 1 <= int(chapter) <= BOOK_CHAPTERS[book]:
+        return None   # bits == 0: a stub, which _resolve_lang serves from its fallback
+    return _corpus().availability.chapter_status(bits, book, int(chapter))
+
+def _count_status(available: int, total: int) -> str:
+    return "none" if not available else "full" if available >= total else "partial"
+
+def _book_availability(lang: str):
+    """{ slug: { "status", "chapters": [status of chapter 1, 2, ...] } } from the bitmap, or None."""
+    bits = _availability_bits(lang)
+    if not bits:
+        return None
+    avail = _corpus().availability
+    out = {}
+    for slug in BOOK_SLUGS:
+        chapters = [avail.chapter_status(bits, slug, n) for n in range(1, BOOK_CHAPTERS[slug] + 1)]
+        status = chapters[0] if len(set(chapters)) == 1 else "partial"
+        out[slug] = {"status": status, "chapters": chapters}
+    return out
+
+def _resolve_lang(lang: str):
+    """(served_lang, data): the language itself, or for stubs the first fallback with verses."""
+    data = _load_book_data(lang)
+    if not data or _has_verses(data):
+        return lang, data
+    for alt in LANG_FALLBACKS.get(lang, []) + [DEFAULT_FALLBACK_LANG]:
+        alt_data = _load_book_data(alt)
+        if alt_data and _has_verses(alt_data):
+            return alt, alt_data
+    return lang, data
 
 # ----------------------------
 # Flask app & routes
@@ -123,8 +428,39 @@ app.config.setdefault("SMTP_PASS", os.environ.get("SMTP_PASS", ""))
 app.config.setdefault("SMTP_SENDER", os.environ.get("SMTP_SENDER", "no-reply@example.com"))
 # If emails aren't configured, optionally show dev links on pages (never enable in prod)
 app.config.setdefault("SHOW_DEV_LINKS", os.environ.get("SHOW_DEV_LINKS", "1" if not os.environ.get("SMTP_HOST") else "0") in ("1","true","True"))
+app.config.setdefault("ADMIN_EMAILS", {e.strip().lower() for e in os.environ.get("ADMIN_EMAILS", "").split(",") if e.strip()})
 app.config.setdefault("SMTP_USE_SSL", os.environ.get("SMTP_USE_SSL", "0") in ("1","true","True"))
 
+# --- SQLite tuning ---
+# users.db is one file shared by every gunicorn worker. WAL lets readers run
+# alongside the single writer, busy_timeout makes a writer wait for the lock
+# instead of failing with "database is locked", and synchronous=NORMAL is
+# durable across application crashes in WAL mode (only an OS crash can drop
+# the last commits). See tools/bench_sqlite_writes.py for the numbers.
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").upper()   # OFF | NORMAL | FULL
+
+_db_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+if _db_uri.startswith("sqlite") and _db_uri != "sqlite://" and ":memory:" not in _db_uri:
+    # One connection per request thread; sync workers use 1, gthread workers up to WEB_THREADS.
+    _threads = int(os.environ.get("WEB_THREADS", "1"))
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", str(max(2, _threads)))),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", str(_threads))),
+        "pool_timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+        "connect_args": {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000, "check_same_thread": False},
+    })
+
+@event.listens_for(Engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _record):
+    if not isinstance(dbapi_conn, sqlite3.Connection):
+        return
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cur.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cur.close()
+
 # --- DB & User model ---
 db = SQLAlchemy(app)
 
@@ -142,6 +478,28 @@ class User(db.Model):
     def check_password(self, raw: str) -> bool:
         return check_password_hash(self.password_hash, raw)
 
+class ReadingProgress(db.Model):
+    """Last position read per (user, book); written in batches by _ProgressCoalescer."""
+    __tablename__ = "reading_progress"
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    book = db.Column(db.String(16), primary_key=True)
+    chapter = db.Column(db.Integer, nullable=False)
+    verse = db.Column(db.Integer, nullable=True)
+    lang = db.Column(db.String(16), nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class Bookmark(db.Model):
+    __tablename__ = "bookmarks"
+    __table_args__ = (db.UniqueConstraint("user_id", "book", "chapter", "verse"),)
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    book = db.Column(db.String(16), nullable=False)
+    chapter = db.Column(db.Integer, nullable=False)
+    verse = db.Column(db.Integer, nullable=False, default=0)   # 0 = whole chapter
+    lang = db.Column(db.String(16), nullable=True)
+    note = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
 # Ensure tables exist (safe if already created)
 with app.app_context():
     db.create_all()
@@ -209,6 +567,185 @@ def _abs_url(endpoint, **params):
         base = ""
     return base + url_for(endpoint, **params)
 
+# --- on-demand request profiling ---
+# Disabled unless PROFILE_DIR is set; when disabled no hooks are registered at all.
+# A request is profiled when it carries a valid signed "X-Profile" header (mint one
+# with `python tools/flamegraph.py token`) or is picked by PROFILE_SAMPLE_RATE.
+# PROFILE_MODE=cprofile writes <...>.prof (pstats); PROFILE_MODE=sample runs a
+# stack sampler and writes <...>.collapsed. tools/flamegraph.py renders either.
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MODE = os.environ.get("PROFILE_MODE", "cprofile")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "1"))
+PROFILE_TOKEN_MAX_AGE = int(os.environ.get("PROFILE_TOKEN_MAX_AGE", str(7 * 24 * 3600)))
+
+class _StackSampler:
+    """Samples one thread's Python stack every `interval` seconds into collapsed-stack counts."""
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.counts.items())
+
+if PROFILE_DIR:
+    import cProfile
+    import random
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    def _profile_requested() -> bool:
+        token = request.headers.get("X-Profile", "")
+        if token:
+            try:
+                s = URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="profile")
+                return s.loads(token, max_age=PROFILE_TOKEN_MAX_AGE).get("op") == "profile"
+            except (BadSignature, SignatureExpired):
+                return False
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    @app.before_request
+    def _profile_start():
+        if not _profile_requested():
+            return
+        g._profile_started = time.perf_counter()
+        if PROFILE_MODE == "sample":
+            g._profiler = _StackSampler(threading.get_ident(), PROFILE_INTERVAL_MS / 1000)
+            g._profiler.start()
+            return
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            return   # another request in this process is already under cProfile
+        g._profiler = prof
+
+    @app.teardown_request
+    def _profile_stop(_exc):
+        prof = g.pop("_profiler", None)
+        if prof is None:
+            return
+        elapsed_ms = (time.perf_counter() - g.pop("_profile_started")) * 1000
+        endpoint = re.sub(r"[^A-Za-z0-9_-]", "_", request.endpoint or "unknown")
+        name = f"{int(time.time() * 1000)}-{os.getpid()}-{endpoint}-{elapsed_ms:.0f}ms"
+        try:
+            if isinstance(prof, _StackSampler):
+                prof.stop()
+                with open(os.path.join(PROFILE_DIR, name + ".collapsed"), "w", encoding="utf-8") as f:
+                    f.write(prof.collapsed())
+            else:
+                prof.disable()
+                prof.dump_stats(os.path.join(PROFILE_DIR, name + ".prof"))
+        except Exception as e:
+            app.logger.error("Writing profile %s failed: %s", name, e)
+
+# --- background threads ---
+# The access log writer, progress flusher and corpus watcher start their thread
+# on first use, not at import: under preload_app the module is imported in
+# gunicorn's master, and threads don't survive the fork into the workers.
+def _ensure_daemon(owner, target, name: str):
+    """Starts target on a daemon thread kept in owner.thread, unless one is already running."""
+    if owner.thread is not None and owner.thread.is_alive():
+        return
+    with owner.lock:
+        if owner.thread is None or not owner.thread.is_alive():
+            owner.thread = threading.Thread(target=target, name=name, daemon=True)
+            owner.thread.start()
+
+# --- API access log (JSONL) ---
+# Disabled unless ACCESS_LOG_PATH is set (e.g. instance/requests.jsonl). Requests
+# only append a small dict to an in-memory buffer; a background thread writes
+# batches every ACCESS_LOG_FLUSH_SECONDS. If the buffer is full, records are
+# dropped and counted rather than slowing requests down. Only allow-listed query
+# parameters are kept (no tokens, emails or notes). tools/loadtest.py --replay
+# drives a server with the recorded mix.
+ACCESS_LOG_PATH = os.environ.get("ACCESS_LOG_PATH", "")
+ACCESS_LOG_FLUSH_SECONDS = float(os.environ.get("ACCESS_LOG_FLUSH_SECONDS", "1"))
+ACCESS_LOG_BUFFER_MAX = int(os.environ.get("ACCESS_LOG_BUFFER_MAX", "10000"))
+ACCESS_LOG_PARAMS = {"book", "chapter", "verse", "lang", "langs", "pair", "src", "dst", "word",
+                     "since", "gzip", "q", "mode", "trace"}
+
+class _AccessLogWriter:
+    def __init__(self, path: str, flush_seconds: float, buffer_max: int):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.buffer_max = buffer_max
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.dropped = 0
+        self.thread = None
+
+    def record(self, entry: dict):
+        with self.lock:
+            if len(self.buffer) >= self.buffer_max:
+                self.dropped += 1
+                return
+            self.buffer.append(entry)
+        _ensure_daemon(self, self._run, "access-log")
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+        if not batch:
+            return
+        data = "".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in batch)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:   # one append per batch
+                f.write(data)
+        except OSError as e:
+            app.logger.error("Access log write failed: %s", e)
+
+if ACCESS_LOG_PATH:
+    _ACCESS_LOG = _AccessLogWriter(ACCESS_LOG_PATH, ACCESS_LOG_FLUSH_SECONDS, ACCESS_LOG_BUFFER_MAX)
+    atexit.register(_ACCESS_LOG.flush)
+
+    @app.before_request
+    def _access_log_start():
+        g._access_t0 = time.perf_counter()
+
+    @app.after_request
+    def _access_log_record(resp):
+        if request.path.startswith("/api/") and not request.path.startswith("/api/admin/"):
+            t0 = g.get("_access_t0")
+            _ACCESS_LOG.record({
+                "ts": round(time.time(), 3),
+                "method": request.method,
+                "route": request.path,
+                "params": {k: v for k, v in request.args.items() if k in ACCESS_LOG_PARAMS},
+                "status": resp.status_code,
+                "ms": round((time.perf_counter() - t0) * 1000, 2) if t0 else None,
+                "bytes": resp.content_length,   # header only: never materialize a streamed body
+            })
+        return resp
+
 # --- session helpers ---
 def login_required(fn):
     from functools import wraps
@@ -221,6 +758,18 @@ def login_required(fn):
         return fn(*args, **kwargs)
     return wrapper
 
+def admin_required(fn):
+    """JSON endpoints for operators: the logged-in user's email must be in ADMIN_EMAILS and verified
+    (signup logs new accounts in before verification, so the address alone proves nothing)."""
+    from functools import wraps
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if (not g.user or not g.user.email_verified_at
+                or g.user.email not in app.config["ADMIN_EMAILS"]):
+            return jsonify({"error": "Forbidden"}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
 @app.before_request
 def load_current_user():
     uid = session.get("user_id")
@@ -233,10 +782,14 @@ def healthz():
 
 @app.route('/api/books')
 def api_books():
-    lang = request.args.get('lang', 'por').lower().strip()
+    lang = _clean_lang(request.args.get('lang', 'por').strip())
     try:
         data = _get_books_for_lang(lang)
-        return jsonify({"lang": lang, "books": data})
+        corpus = _corpus()
+        chapter_word = corpus.index.get(lang, {}).get("chapterWord") or corpus.names.get(lang, {}).get("chapter", "")
+        statuses = {b.get("status") for b in data}
+        status = statuses.pop() if len(statuses) == 1 else "partial"
+        return jsonify({"lang": lang, "books": data, "chapterWord": chapter_word, "status": status})
     except Exception as e:
         return jsonify({"error": f"Failed to load books for {lang}: {e}"}), 500
 
@@ -401,6 +954,256 @@ def api_me():
     })
 
 
+# ----------------------------
+# Reading progress & bookmarks (batched, write-coalesced)
+# ----------------------------
+# Clients POST batches of events; the worker folds them into per-user state in
+# memory and a background thread flushes all dirty users in one transaction
+# every PROGRESS_FLUSH_SECONDS. Reads come from that state, so page turns never
+# wait on SQLite. State is per worker: another worker sees a change after the
+# flush, once its own cached copy expires (PROGRESS_STATE_TTL after it was
+# loaded, however often it is read). Progress rows are only ever replaced by a
+# newer event, so a worker holding stale state can't roll another one's back.
+PROGRESS_FLUSH_SECONDS = float(os.environ.get("PROGRESS_FLUSH_SECONDS", "5"))
+PROGRESS_STATE_TTL = float(os.environ.get("PROGRESS_STATE_TTL", "60"))
+PROGRESS_MAX_EVENTS = 200
+# Client clocks: events up to PROGRESS_MAX_SKEW_MS ahead of server time are clamped
+# to "now"; anything further ahead, or older than PROGRESS_MAX_AGE_DAYS (offline
+# queues), is rejected so a bogus ts can't pin a book or break the flush.
+PROGRESS_MAX_SKEW_MS = int(os.environ.get("PROGRESS_MAX_SKEW_MS", str(5 * 60 * 1000)))
+PROGRESS_MAX_AGE_DAYS = int(os.environ.get("PROGRESS_MAX_AGE_DAYS", "90"))
+
+def _epoch_ms(dt) -> int:
+    # stored datetimes are naive UTC (datetime.utcnow)
+    return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+def _progress_upsert(uid: int, book: str, entry: dict, updated_at):
+    """INSERT ... ON CONFLICT DO UPDATE that leaves a row alone unless this event is newer."""
+    if db.engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = ReadingProgress.__table__
+    stmt = insert(table).values(user_id=uid, book=book, chapter=entry["chapter"], verse=entry["verse"],
+                                lang=entry["lang"], updated_at=updated_at)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.book],
+        set_={c: stmt.excluded[c] for c in ("chapter", "verse", "lang", "updated_at")},
+        where=table.c.updated_at < stmt.excluded.updated_at,
+    )
+
+def _utc_from_ms(ms):
+    """Naive UTC datetime for an epoch-ms value, or None if it can't be represented."""
+    try:
+        return datetime.utcfromtimestamp(ms / 1000)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+class _ProgressCoalescer:
+    def __init__(self, flush_seconds: float, state_ttl: float):
+        self.flush_seconds = flush_seconds
+        self.state_ttl = state_ttl
+        self.lock = threading.Lock()
+        self.state = {}   # { uid: {"progress": {book: entry}, "bookmarks": {(book, ch, v): entry}, "at": ts} }
+        self.dirty = {}   # { uid: {"progress": {book: entry}, "bookmarks": {(book, ch, v): entry | None}} }
+        self.thread = None
+        self.stats = {"events": 0, "flushes": 0, "rows": 0}
+
+    # --- reads ---
+    def _load(self, uid: int):
+        progress = {
+            r.book: {"book": r.book, "chapter": r.chapter, "verse": r.verse, "lang": r.lang,
+                     "ts": _epoch_ms(r.updated_at)}
+            for r in ReadingProgress.query.filter_by(user_id=uid)
+        }
+        bookmarks = {
+            (b.book, b.chapter, b.verse): {"book": b.book, "chapter": b.chapter, "verse": b.verse,
+                                           "lang": b.lang, "note": b.note,
+                                           "ts": _epoch_ms(b.created_at)}
+            for b in Bookmark.query.filter_by(user_id=uid)
+        }
+        return {"progress": progress, "bookmarks": bookmarks, "at": time.time()}
+
+    def _state_for(self, uid: int):
+        with self.lock:
+            st = self.state.get(uid)
+            if st:
+                return st   # "at" stays the load time: the TTL bounds staleness, not idleness
+        loaded = self._load(uid)   # outside the lock: a DB read
+        with self.lock:
+            st = self.state.setdefault(uid, loaded)
+            # replay anything that arrived while we were loading
+            pending = self.dirty.get(uid)
+            if pending and st is loaded:
+                st["progress"].update(pending["progress"])
+                for key, entry in pending["bookmarks"].items():
+                    if entry is None:
+                        st["bookmarks"].pop(key, None)
+                    else:
+                        st["bookmarks"][key] = entry
+            return st
+
+    def snapshot(self, uid: int):
+        st = self._state_for(uid)
+        with self.lock:
+            progress = sorted(st["progress"].values(), key=lambda e: e["ts"], reverse=True)
+            bookmarks = sorted(st["bookmarks"].values(), key=lambda e: e["ts"], reverse=True)
+        return {"progress": progress, "bookmarks": bookmarks}
+
+    # --- writes ---
+    def apply(self, uid: int, events):
+        st = self._state_for(uid)
+        with self.lock:
+            d = self.dirty.setdefault(uid, {"progress": {}, "bookmarks": {}})
+            for ev in events:
+                if ev["type"] == "progress":
+                    cur = st["progress"].get(ev["book"])
+                    if cur and cur["ts"] > ev["ts"]:
+                        continue   # out-of-order event from an older batch
+                    entry = {k: ev[k] for k in ("book", "chapter", "verse", "lang", "ts")}
+                    st["progress"][ev["book"]] = d["progress"][ev["book"]] = entry
+                else:
+                    key = (ev["book"], ev["chapter"], ev["verse"])
+                    if ev["op"] == "remove":
+                        st["bookmarks"].pop(key, None)
+                        d["bookmarks"][key] = None
+                    else:
+                        entry = {k: ev[k] for k in ("book", "chapter", "verse", "lang", "note", "ts")}
+                        st["bookmarks"][key] = d["bookmarks"][key] = entry
+            self.stats["events"] += len(events)
+        _ensure_daemon(self, self._run, "progress-flush")
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                app.logger.error("Progress flush failed: %s", e)
+
+    def flush(self):
+        with self.lock:
+            batch, self.dirty = self.dirty, {}
+            cutoff = time.time() - self.state_ttl
+            for uid in [u for u, st in self.state.items() if st["at"] < cutoff and u not in batch]:
+                del self.state[uid]
+        if not batch:
+            return 0
+        rows = 0
+        with app.app_context():
+            try:
+                for uid, d in batch.items():
+                    for book, e in d["progress"].items():
+                        updated_at = _utc_from_ms(e["ts"])
+                        if updated_at is None:
+                            # one bad row must not hold back the batch (a requeue would retry it forever)
+                            app.logger.warning("Dropping progress row with bad ts %r (user %s)", e["ts"], uid)
+                            continue
+                        rows += db.session.execute(_progress_upsert(uid, book, e, updated_at)).rowcount
+                    for (book, ch, v), e in d["bookmarks"].items():
+                        created_at = _utc_from_ms(e["ts"]) if e is not None else None
+                        if e is not None and created_at is None:
+                            app.logger.warning("Dropping bookmark row with bad ts %r (user %s)", e["ts"], uid)
+                            continue
+                        existing = Bookmark.query.filter_by(user_id=uid, book=book, chapter=ch, verse=v).first()
+                        if e is None:
+                            if existing:
+                                db.session.delete(existing)
+                        elif existing:
+                            existing.lang, existing.note = e["lang"], e["note"]
+                        else:
+                            db.session.add(Bookmark(
+                                user_id=uid, book=book, chapter=ch, verse=v, lang=e["lang"], note=e["note"],
+                                created_at=created_at))
+                        rows += 1
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self._requeue(batch)
+                raise
+            finally:
+                db.session.remove()
+        with self.lock:
+            self.stats["flushes"] += 1
+            self.stats["rows"] += rows
+        return rows
+
+    def _requeue(self, batch):
+        """Put a failed batch back without overwriting anything newer that arrived meanwhile."""
+        with self.lock:
+            for uid, d in batch.items():
+                cur = self.dirty.setdefault(uid, {"progress": {}, "bookmarks": {}})
+                for book, e in d["progress"].items():
+                    cur["progress"].setdefault(book, e)
+                for key, e in d["bookmarks"].items():
+                    cur["bookmarks"].setdefault(key, e)
+
+_PROGRESS = _ProgressCoalescer(PROGRESS_FLUSH_SECONDS, PROGRESS_STATE_TTL)
+
+@atexit.register
+def _flush_progress_on_exit():
+    try:
+        _PROGRESS.flush()
+    except Exception as e:
+        app.logger.error("Progress flush at exit failed: %s", e)
+
+def _parse_progress_event(raw):
+    """Validates one client event; returns a normalized dict or None."""
+    if not isinstance(raw, dict):
+        return None
+    book = str(raw.get("book", "")).strip().lower()
+    try:
+        chapter = int(raw.get("chapter"))
+        verse = int(raw.get("verse") or 0)
+        ts = int(raw.get("ts") or time.time() * 1000)
+    except (TypeError, ValueError):
+        return None
+    if book not in BOOK_CHAPTERS or not 1 <= chapter <= BOOK_CHAPTERS[book] or verse < 0:
+        return None
+    now = int(time.time() * 1000)
+    if ts > now + PROGRESS_MAX_SKEW_MS or ts < now - PROGRESS_MAX_AGE_DAYS * 86400 * 1000:
+        return None
+    ts = min(ts, now)
+    ev = {"book": book, "chapter": chapter, "verse": verse, "ts": ts,
+          "lang": _clean_lang(str(raw.get("lang") or ""))[:16] or None}
+    kind = raw.get("type", "progress")
+    if kind == "progress":
+        ev["type"] = "progress"
+    elif kind == "bookmark":
+        ev["type"] = "bookmark"
+        ev["op"] = "remove" if raw.get("op") == "remove" else "add"
+        ev["note"] = (str(raw.get("note") or "")[:500]) or None
+    else:
+        return None
+    return ev
+
+@app.route("/api/progress", methods=["GET", "POST"])
+def api_progress():
+    """
+    GET  -> {"progress": [...], "bookmarks": [...]} for the logged-in user.
+    POST {"events": [{"type": "progress", "book": "alma", "chapter": 32, "verse": 21, "lang": "eng", "ts": ms},
+                     {"type": "bookmark", "op": "add"|"remove", "book": ..., "chapter": ..., "verse": ..., "note": ...}]}
+    """
+    if not g.user:
+        return jsonify({"error": "Not authenticated"}), 401
+    if request.method == "GET":
+        return jsonify(_PROGRESS.snapshot(g.user.id))
+
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object with an 'events' list"}), 400
+    raw_events = body.get("events")
+    if not isinstance(raw_events, list) or not raw_events:
+        return jsonify({"error": "Expected a non-empty 'events' list"}), 400
+    if len(raw_events) > PROGRESS_MAX_EVENTS:
+        return jsonify({"error": f"At most {PROGRESS_MAX_EVENTS} events per batch"}), 400
+    events = [ev for ev in map(_parse_progress_event, raw_events) if ev]
+    events.sort(key=lambda ev: ev["ts"])
+    if events:
+        _PROGRESS.apply(g.user.id, events)
+    return jsonify({"accepted": len(events), "rejected": len(raw_events) - len(events)}), 202
+
+
 # Example of protecting an endpoint (uncomment if you add a private page)
 # @app.get("/account")
 # @login_required
@@ -408,61 +1211,131 @@ def api_me():
 #     return jsonify({"email": g.user.email, "created_at": g.user.created_at.isoformat()})
 
 
+def _chapter_verses(chapter_content):
+    """
+    Converts a chapter dict to a sorted verse list.
+    The JSON looks like: { "intro": "...", "1": "And it came...", "2": "..." }
+    """
+    verses_list = []
+    for key, text in chapter_content.items():
+        if key == "intro":
+            continue # Skip intro here, handled in api/intro
+        n = _verse_number(key)
+        verses_list.append({
+            "verse": key,
+            "n": n if n is not None else 0,   # numeric verse, for aligning columns ("๑๒", "12." -> 12)
+            "text": text
+        })
+    # Sort by verse number (keys may use native digits, e.g. "๑๒" or "፲፪")
+    verses_list.sort(key=lambda x: x["n"])
+    return verses_list
+
+# Encoded /api/chapter bodies, so page turns (and prefetches of the next
+# chapter) skip rebuilding and re-serializing the verse list.
+_CHAPTER_CACHE = OrderedDict()   # { (lang, book, chapter): (source tag, body) }, LRU order
+_CHAPTER_CACHE_MAX = int(os.environ.get("CHAPTER_CACHE_MAX", "2048"))
+_CHAPTER_CACHE_LOCK = threading.Lock()
+
+def _chapter_cache_get(key, tag):
+    with _CHAPTER_CACHE_LOCK:
+        hit = _CHAPTER_CACHE.get(key)
+        if hit and hit[0] == tag:
+            _CHAPTER_CACHE.move_to_end(key)
+            return hit[1]
+    return None
+
+def _chapter_cache_put(key, tag, body):
+    with _CHAPTER_CACHE_LOCK:
+        _CHAPTER_CACHE[key] = (tag, body)
+        while len(_CHAPTER_CACHE) > _CHAPTER_CACHE_MAX:
+            _CHAPTER_CACHE.popitem(last=False)
+
+def _chapter_body(chapter_content, book, chapter, lang, served):
+    """The encoded /api/chapter JSON (shared with the warm-up)."""
+    payload = {
+        "verses": _chapter_verses(chapter_content),
+        "book": book,
+        "chapter": chapter,
+        "lang": lang
+    }
+    if served != lang:
+        payload["servedLang"] = served
+    return app.json.dumps(payload)
+
+def _next_chapter(book: str, chapter: int):
+    """Same wrap-around as the prev/next buttons in js/app.js."""
+    if chapter < BOOK_CHAPTERS[book]:
+        return book, chapter + 1
+    i = BOOK_SLUGS.index(book)
+    return BOOK_SLUGS[(i + 1) % len(BOOK_SLUGS)], 1
+
+def _chapter_url(book, chapter, lang):
+    # Same parameter order as js/app.js so prefetched responses match the later fetch
+    return f"/api/chapter?book={quote(str(book))}&chapter={quote(str(chapter))}&lang={quote(str(lang))}"
+
+def _prefetch_links(book, chapter, langs):
+    if book not in BOOK_CHAPTERS or not str(chapter).isdigit():
+        return ""
+    nb, nc = _next_chapter(book, int(chapter))
+    return ", ".join(f"<{_chapter_url(nb, nc, l)}>; rel=prefetch" for l in langs if l)
+
 @app.route('/api/chapter')
 def api_chapter():
     #Fetches verses for a given book + chapter + lang from local JSON files.
     book = request.args.get('book')
     chapter = request.args.get('chapter')
     lang = request.args.get('lang', 'por')
+    pair = request.args.get('pair', '')   # the other column's language, for prefetch hints
 
     if not book or not chapter:
         return jsonify({"error": "Missing 'book' or 'chapter' parameter"}), 400
 
-    # 1. Load data from local file
-    data = _load_book_data(lang)
+    # Chapters missing from a partial language are known from its bitmap, without loading the file
+    if _chapter_availability(lang, book, chapter) == "none":
+        return jsonify({"error": "Chapter not available in this language", "status": "none", "verses": [], "lang": lang}), 404
+
+    # 1. Load data from local file (stub languages resolve to their fallback)
+    served, data = _resolve_lang(lang)
     if not data:
         return jsonify({"error": f"Language '{lang}' not found"}), 404
 
-    # 2. Access the specific book and chapter
-    # Structure assumption: data[slug]["chapters"][chapter_number]
-    try:
-        book_data = data.get(book)
-        if not book_data:
-             return jsonify({"error": "Book not found", "verses": []}), 404
-             
-        # Access the "chapters" key first
-        chapters_data = book_data.get("chapters", {})
-        chapter_content = chapters_data.get(str(chapter))
-       
-        if not chapter_content:
-             return jsonify({"error": "Chapter not found", "verses": []}), 404
-             
-        # 3. Convert dictionary verses to a sorted list
-        # The JSON looks like: { "intro": "...", "1": "And it came...", "2": "..." }
-        verses_list = []
-        
-        for key, text in chapter_content.items():
-            if key == "intro":
-                continue # Skip intro here, handled in api/intro
-            
-            # Create a verse object
-            verses_list.append({
-                "verse": key,
-                "text": text
-            })
-            
-        # Sort by verse number (convert string "10" to int 10 for correct sorting)
-        verses_list.sort(key=lambda x: int(x["verse"]) if x["verse"].isdigit() else 0)
-            
-        return jsonify({
-            "verses": verses_list,
-            "book": book,
-            "chapter": chapter,
-            "lang": lang
-        })
-    except Exception as e:
-        app.logger.error(f"Lookup error: {e}")
-        return jsonify({"error": "Internal lookup error", "verses": []}), 500    
+    tag = _source_tag(sorted({_clean_lang(lang), _clean_lang(served)}))
+    key = (lang, book, str(chapter))
+    body = _chapter_cache_get(key, tag)
+
+    if body is None:
+        # A real chapter the file lacks is the same gap the bitmap reports (the bitmap
+        # is ignored once the file changes size), so it gets the same "status": "none".
+        gap = {"status": "none"} if str(chapter).isdigit() and 1 <= int(chapter) <= BOOK_CHAPTERS.get(book, 0) else {}
+        # 2. Access the specific book and chapter
+        # Structure assumption: data[slug]["chapters"][chapter_number]
+        try:
+            book_data = data.get(book)
+            if not book_data:
+                 return jsonify({"error": "Book not found", "verses": [], **gap}), 404
+                 
+            # Access the "chapters" key first
+            chapters_data = book_data.get("chapters", {})
+            chapter_content = chapters_data.get(str(chapter))
+           
+            if not chapter_content:
+                 return jsonify({"error": "Chapter not found", "verses": [], **gap}), 404
+                 
+            # 3. Convert dictionary verses to a sorted list
+            body = _chapter_body(chapter_content, book, chapter, lang, served)
+        except Exception as e:
+            app.logger.error(f"Lookup error: {e}")
+            return jsonify({"error": "Internal lookup error", "verses": []}), 500    
+
+        _chapter_cache_put(key, tag, body)
+
+    resp = app.response_class(body, mimetype="application/json")
+    resp.set_etag(f"{tag}-{book}-{chapter}")
+    resp.headers["Cache-Control"] = "public, max-age=3600"
+    links = _prefetch_links(book, chapter, [lang, pair])
+    if links:
+        resp.headers["Link"] = links
+    return resp.make_conditional(request)
 
 @app.get("/api/intro")
 def api_intro():
@@ -471,8 +1344,8 @@ def api_intro():
     lang = request.args.get("lang", "eng").strip().lower()
 
     
-    # Load from local JSON
-    data = _load_book_data(lang)
+    # Load from local JSON (stub languages resolve to their fallback)
+    _served, data = _resolve_lang(lang)
     if not data:
         return jsonify({"subtitle": "", "introduction": ""})
         
@@ -491,6 +1364,1073 @@ def api_intro():
     except Exception:
         return jsonify({"subtitle": "", "introduction": ""})    
 
+@app.get("/api/availability")
+def api_availability():
+    """
+    Which chapters / verses a language has, from its bitmap (no verse text loaded).
+      /api/availability?lang=cym                       -> per-book and per-chapter status
+      /api/availability?lang=cym&book=1-ne&chapter=3   -> status + verse numbers present (0 = unnumbered text)
+    """
+    lang = _clean_lang(request.args.get("lang", "").strip())
+    if not lang:
+        return jsonify({"error": "Missing 'lang' parameter"}), 400
+    bits = _availability_bits(lang)
+    if bits is None:
+        return jsonify({"error": f"No availability data for '{lang}'"}), 404
+    served = lang
+    if not bits:
+        # Stub: readers get the fallback language's text, so report its availability
+        served = _resolve_lang(lang)[0]
+        bits = _availability_bits(served) or 0
+
+    avail = _corpus().availability
+    book = request.args.get("book", "").strip().lower()
+    chapter = request.args.get("chapter", "").strip()
+    if book or chapter:
+        if book not in BOOK_CHAPTERS or not chapter.isdigit() or not 1 <= int(chapter) <= BOOK_CHAPTERS[book]:
+            return jsonify({"error": "Unknown book or chapter"}), 404
+        payload = {
+            "lang": lang, "book": book, "chapter": chapter,
+            "status": avail.chapter_status(bits, book, int(chapter)),
+            "verses": avail.chapter_verses(bits, book, int(chapter)),
+        }
+    else:
+        books = _book_availability(served) or {
+            slug: {"status": "none", "chapters": ["none"] * BOOK_CHAPTERS[slug]} for slug in BOOK_SLUGS}
+        statuses = {b["status"] for b in books.values()}
+        payload = {"lang": lang, "status": statuses.pop() if len(statuses) == 1 else "partial", "books": books}
+    if served != lang:
+        payload["servedLang"] = served
+    resp = jsonify(payload)
+    resp.set_etag(f"{_source_tag(sorted({lang, served}))}-avail-{book}-{chapter}")
+    resp.headers["Cache-Control"] = "public, max-age=3600"
+    return resp.make_conditional(request)
+
+# ----------------------------
+# Word alignment (tables built offline by tools/build_alignment.py)
+# ----------------------------
+_ALIGN_CACHE = {}   # { (src, dst): { "<src word>": [("<dst word>", score), ...] } | None (file unreadable) }
+_ALIGN_CACHE_MAX = 64   # only pairs whose file exists are cached; oldest dropped past this
+
+# Keep in sync with tools/build_alignment.py (the tables are keyed by these tokens)
+_TOKEN_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]"
+    r"|(?:[^\W\d_]|[\u0300-\u036f\u0483-\u0489\u0591-\u05c7\u0610-\u061a"
+    r"\u064b-\u065f\u0670\u0900-\u0dff\u0e00-\u0eff\u1000-\u109f])+"
+)
+
+def _tokenize(text: str):
+    return _TOKEN_RE.findall(text.casefold())
+
+def _load_alignment(src: str, dst: str):
+    """Loads derived/align/<src>.<dst>.json as { word: [(candidate, score), ...] } (None if not built)."""
+    key = (_clean_lang(src), _clean_lang(dst))
+    if key in _ALIGN_CACHE:
+        return _ALIGN_CACHE[key]
+    path = os.path.join(DERIVED_DIR, "align", f"{key[0]}.{key[1]}.json")
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return None   # not built: nothing to cache or watch, so arbitrary pairs can't grow either
+    _corpus().stamps.setdefault(path, stamp)   # lets the watcher drop it when rebuilt
+    table = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        vocab = raw["vocab"]
+        table = {w: [(vocab[i], s / 1000) for i, s in cands] for w, cands in raw["words"].items()}
+    except Exception as e:
+        app.logger.error("Error reading %s: %s", path, e)
+    if len(_ALIGN_CACHE) >= _ALIGN_CACHE_MAX:
+        _ALIGN_CACHE.pop(next(iter(_ALIGN_CACHE)), None)
+    _ALIGN_CACHE[key] = table
+    return table
+
+def _verse_hints(table, src_text: str, dst_text: str):
+    """Pairs each source word with its best candidate that actually occurs in the target verse."""
+    dst_tokens = set(_tokenize(dst_text))
+    hints, seen = [], set()
+    for word in _tokenize(src_text):
+        if word in seen:
+            continue
+        seen.add(word)
+        for cand, score in table.get(word, ()):
+            if cand in dst_tokens:
+                hints.append({"src": word, "dst": cand, "score": score})
+                break
+    return hints
+
+@app.get("/api/align")
+def api_align():
+    """
+    Word translation candidates between two languages.
+      /api/align?src=eng&dst=por&word=god                  -> ranked candidates
+      /api/align?src=eng&dst=por&book=1-ne&chapter=1[&verse=2] -> per-verse highlight hints
+    """
+    src = _clean_lang(request.args.get("src", "").strip())
+    dst = _clean_lang(request.args.get("dst", "").strip())
+    if not src or not dst:
+        return jsonify({"error": "Missing 'src' or 'dst' parameter"}), 400
+
+    table = _load_alignment(src, dst)
+    if table is None:
+        return jsonify({"error": f"No alignment table for {src} -> {dst}"}), 404
+
+    word = request.args.get("word", "").strip()
+    if word:
+        tokens = _tokenize(word)
+        cands = table.get(tokens[0], []) if tokens else []
+        return jsonify({
+            "src": src, "dst": dst, "word": word,
+            "candidates": [{"word": w, "score": s} for w, s in cands],
+        })
+
+    book = request.args.get("book", "").strip().lower()
+    chapter = request.args.get("chapter", "").strip()
+    if not book or not chapter:
+        return jsonify({"error": "Missing 'word' or 'book'/'chapter' parameters"}), 400
+
+    src_data, dst_data = _load_book_data(src), _load_book_data(dst)
+    if not src_data or not dst_data:
+        return jsonify({"error": "Language not found"}), 404
+    # matched by verse number: "1.", "١" and "፩" are all verse 1
+    src_ch = _numbered_verses(src_data.get(book, {}).get("chapters", {}).get(chapter))
+    dst_ch = _numbered_verses(dst_data.get(book, {}).get("chapters", {}).get(chapter))
+
+    verse = request.args.get("verse", "").strip()
+    nums = [_verse_number(verse)] if verse else list(src_ch)
+    hints = {str(n): _verse_hints(table, src_ch[n], dst_ch[n]) for n in nums if n in src_ch and n in dst_ch}
+    return jsonify({"src": src, "dst": dst, "book": book, "chapter": chapter, "hints": hints})
+
+# ----------------------------
+# Related verses (tables built offline by tools/build_related.py)
+# ----------------------------
+_RELATED_CACHE = {}   # { lang: { "ids": [...], "pos": {id: i}, "k": k, "idx": array, "score": array } | None }
+_RELATED_CACHE_MAX = 64   # only languages whose file exists are cached; oldest dropped past this
+RELATED_MAX_POOL = 6
+
+def _load_related(lang: str):
+    """Loads derived/related/<lang>.json into flat arrays (k slots per verse, -1 = empty); None if not built."""
+    lang = _clean_lang(lang)
+    if lang in _RELATED_CACHE:
+        return _RELATED_CACHE[lang]
+    path = os.path.join(DERIVED_DIR, "related", f"{lang}.json")
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return None   # not built: nothing to cache or watch, so arbitrary lang/pool values can't grow either
+    _corpus().stamps.setdefault(path, stamp)   # lets the watcher drop it when rebuilt
+    table = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        k = raw["k"]
+        idx, score = array("i", [-1]) * (k * len(raw["ids"])), array("H", [0]) * (k * len(raw["ids"]))
+        for i, row in enumerate(raw["neighbors"]):
+            for slot, (j, s) in enumerate(row[:k]):
+                idx[i * k + slot], score[i * k + slot] = j, s
+        table = {"ids": raw["ids"], "pos": {v: i for i, v in enumerate(raw["ids"])}, "k": k,
+                 "idx": idx, "score": score}
+    except Exception as e:
+        app.logger.error("Error reading %s: %s", path, e)
+    if len(_RELATED_CACHE) >= _RELATED_CACHE_MAX:
+        _RELATED_CACHE.pop(next(iter(_RELATED_CACHE)), None)
+    _RELATED_CACHE[lang] = table
+    return table
+
+def _related_scores(table, verse_id: str):
+    """{ neighbour verse id: cosine } for one verse (empty if the language doesn't have it)."""
+    i = table["pos"].get(verse_id)
+    if i is None:
+        return {}
+    k, ids = table["k"], table["ids"]
+    return {ids[j]: s / 1000 for j, s in zip(table["idx"][i * k:(i + 1) * k], table["score"][i * k:(i + 1) * k])
+            if j >= 0}
+
+def _verse_text(data, book: str, chapter: str, number: int) -> str:
+    content = data.get(book, {}).get("chapters", {}).get(chapter) or {}
+    for key, text in content.items():
+        if key != "intro" and _verse_number(key) == number:
+            return text
+    return ""
+
+@app.get("/api/related")
+def api_related():
+    """
+    Verses similar to one verse, by TF-IDF cosine within a language.
+      /api/related?lang=eng&book=moro&chapter=10&verse=4[&limit=10]
+      ...&pool=eng,por,spa   -> scores averaged across those languages' tables (verse ids line up),
+                                so one translation's wording matters less; text is in `lang`
+    """
+    lang = _clean_lang(request.args.get("lang", "").strip())
+    book = request.args.get("book", "").strip().lower()
+    chapter = request.args.get("chapter", "").strip()
+    verse = _verse_number(request.args.get("verse", ""))
+    if not lang or not book or not chapter or verse is None:
+        return jsonify({"error": "Missing 'lang', 'book', 'chapter' or 'verse' parameter"}), 400
+    verse_id = f"{book}/{chapter}/{verse}"
+
+    pool = [l for l in dict.fromkeys(_clean_lang(x.strip()) for x in request.args.get("pool", "").split(",")) if l]
+    if len(pool) > RELATED_MAX_POOL:
+        return jsonify({"error": f"At most {RELATED_MAX_POOL} languages in 'pool'"}), 400
+    tables = {l: _load_related(l) for l in (pool or [lang])}
+    tables = {l: t for l, t in tables.items() if t and verse_id in t["pos"]}
+    if not tables:
+        if not pool and _load_related(lang) is None:
+            return jsonify({"error": f"No related-verse table for '{lang}'"}), 404
+        return jsonify({"error": f"Verse {verse_id} not found in the related-verse tables"}), 404
+
+    totals = {}
+    for table in tables.values():
+        for vid, s in _related_scores(table, verse_id).items():
+            totals[vid] = totals.get(vid, 0.0) + s
+    limit = max(1, min(request.args.get("limit", 10, type=int) or 10, max(t["k"] for t in tables.values())))
+    ranked = sorted(totals.items(), key=lambda kv: -kv[1])[:limit]
+
+    served, data = _resolve_lang(lang)
+    related = []
+    for vid, total in ranked:
+        b, c, v = vid.split("/")
+        related.append({
+            "book": b, "chapter": c, "verse": int(v),
+            "score": round(total / len(tables), 3),
+            "text": _verse_text(data or {}, b, c, int(v)),
+        })
+    payload = {"lang": lang, "book": book, "chapter": chapter, "verse": verse, "related": related}
+    if pool:
+        payload["pooled"] = list(tables)
+    if served != lang:
+        payload["servedLang"] = served
+    return jsonify(payload)
+
+# ----------------------------
+# Offline bundle: /api/bundle?langs=eng,por
+# ----------------------------
+# NDJSON, one record per line, in a fixed order so byte ranges are stable:
+#   {"type": "bundle", "langs": [...], "tag": "..."}
+#   {"type": "names", "lang": ..., "names": {...}}                       (booksnames.json entry)
+#   {"type": "book", "lang": ..., "book": ..., "name": ..., "chapterWord": ..., "chapters": n}
+#   {"type": "chapter", "lang": ..., "book": ..., "chapter": "1", "intro": "...", "verses": [...]}
+# Archives are written to instance/bundles/ while they stream, so the next
+# download of the same pair (and any Range/resume request) is a plain file send.
+BUNDLE_MAX_LANGS = 4
+BUNDLE_CACHE_MAX = int(os.environ.get("BUNDLE_CACHE_MAX", "16"))   # archives kept on disk
+
+def _bundle_dir():
+    path = os.path.join(app.instance_path, "bundles")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _source_tag(langs):
+    """
+    Short fingerprint of the source files as this request's corpus version saw
+    them; changes when the watcher swaps in a rewritten file.
+    """
+    stamps = _corpus().stamps
+    h = hashlib.sha1()
+    paths = [BOOKSNAMES_PATH] + [os.path.join(BASE_DIR, "all_books", f"{_clean_lang(l)}.json") for l in langs]
+    for path in paths:
+        st = stamps.get(path)
+        if st is None:
+            st = _file_stamp(path)
+            if st is not None:
+                stamps[path] = st   # first sighting: lazy loads record the same stamp
+        h.update(f"{path}:{st[0]}:{st[1]};".encode() if st else f"{path}:missing;".encode())
+    return h.hexdigest()[:12]
+
+def _book_records(lang, slug, data, served=None):
+    """The "book" record followed by one "chapter" record per chapter (shared with /api/book)."""
+    book_data = data.get(slug, {})
+    meta = book_data.get("meta", {})
+    chapters = book_data.get("chapters", {})
+    rec = {
+        "type": "book", "lang": lang, "book": slug,
+        "name": meta.get("name", slug),
+        "chapterWord": meta.get("chapterWord", ""),
+        "chapters": BOOK_CHAPTERS[slug],
+    }
+    if served and served != lang:
+        rec["servedLang"] = served   # stub language: text comes from its fallback
+    yield rec
+    for n in range(1, BOOK_CHAPTERS[slug] + 1):
+        content = chapters.get(str(n)) or {}
+        yield {
+            "type": "chapter", "lang": lang, "book": slug, "chapter": str(n),
+            "intro": content.get("intro", ""),
+            "verses": _chapter_verses(content),
+        }
+
+def _ndjson_line(rec) -> bytes:
+    return (json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def _bundle_records(langs, tag):
+    yield {"type": "bundle", "langs": langs, "tag": tag}
+    for lang in langs:
+        served, data = _resolve_lang(lang)
+        yield {"type": "names", "lang": lang, "names": _corpus().names.get(lang, {})}
+        for slug in BOOK_SLUGS:
+            yield from _book_records(lang, slug, data or {}, served)
+
+def _bundle_chunks(langs, tag, gz):
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31) if gz else None   # wbits=31 -> gzip container
+    for rec in _bundle_records(langs, tag):
+        line = _ndjson_line(rec)
+        chunk = comp.compress(line) if comp else line
+        if chunk:
+            yield chunk
+    if comp:
+        yield comp.flush()
+
+def _evict_bundles(keep: int):
+    d = _bundle_dir()
+    files = [os.path.join(d, n) for n in os.listdir(d) if not n.endswith(".tmp")]
+    files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _tee_to_cache(chunks, path):
+    """Yields chunks while writing them to `path`; the file only appears once complete."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    done = False
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(tmp, path)
+        done = True
+        _evict_bundles(BUNDLE_CACHE_MAX)
+    finally:
+        if not done and os.path.exists(tmp):
+            os.remove(tmp)   # client went away mid-stream
+
+@app.get("/api/bundle")
+def api_bundle():
+    raw = request.args.get("langs", "")
+    langs = []
+    for l in raw.split(","):
+        l = _clean_lang(l.strip())
+        if l and l not in langs:
+            langs.append(l)
+    if not langs:
+        return jsonify({"error": "Missing 'langs' parameter (e.g., langs=eng,por)"}), 400
+    if len(langs) > BUNDLE_MAX_LANGS:
+        return jsonify({"error": f"At most {BUNDLE_MAX_LANGS} languages per bundle"}), 400
+    missing = [l for l in langs if not os.path.exists(os.path.join(BASE_DIR, "all_books", f"{l}.json"))]
+    if missing:
+        return jsonify({"error": f"Language(s) not found: {', '.join(missing)}"}), 404
+
+    gz = request.args.get("gzip", "0") in ("1", "true", "True")
+    # stubs are bundled with their fallback's text, so its file is part of the tag too
+    tag = _source_tag(langs + sorted({_resolve_lang(l)[0] for l in langs} - set(langs)))
+    ext = "ndjson.gz" if gz else "ndjson"
+    mimetype = "application/gzip" if gz else "application/x-ndjson"
+    name = f"{'_'.join(langs)}.{tag}.{ext}"
+    path = os.path.join(_bundle_dir(), name)
+    download_name = f"bofm-{'_'.join(langs)}.{ext}"
+
+    if not os.path.exists(path) and request.range:
+        # Resuming needs stable bytes on disk: finish writing the archive, then serve the range.
+        for _ in _tee_to_cache(_bundle_chunks(langs, tag, gz), path):
+            pass
+
+    if os.path.exists(path):
+        os.utime(path)   # LRU: keep recently requested pairs on disk
+        resp = send_file(path, mimetype=mimetype, as_attachment=True,
+                         download_name=download_name, conditional=True, etag=tag)
+        resp.headers["Cache-Control"] = "public, max-age=3600"
+        return resp
+
+    resp = Response(stream_with_context(_tee_to_cache(_bundle_chunks(langs, tag, gz), path)),
+                    mimetype=mimetype)
+    resp.headers["Content-Disposition"] = f"attachment; filename={download_name}"
+    resp.headers["ETag"] = f'"{tag}"'
+    resp.headers["Accept-Ranges"] = "bytes"
+    return resp
+
+# ----------------------------
+# Whole-book streaming: /api/book?lang=eng&book=alma
+# ----------------------------
+@app.get("/api/book")
+def api_book():
+    """Streams a book as NDJSON (book record, then chapters in order) so the first chapter renders immediately."""
+    lang = _clean_lang(request.args.get("lang", "").strip())
+    book = request.args.get("book", "").strip().lower()
+    if not lang or not book:
+        return jsonify({"error": "Missing 'lang' or 'book' parameter"}), 400
+    if book not in BOOK_CHAPTERS:
+        return jsonify({"error": "Book not found"}), 404
+    served, data = _resolve_lang(lang)
+    if not data:
+        return jsonify({"error": f"Language '{lang}' not found"}), 404
+
+    tag = _source_tag(sorted({lang, served}))
+    if request.if_none_match.contains(f"{tag}-{book}"):
+        return Response(status=304)
+
+    resp = Response(stream_with_context(_ndjson_line(rec) for rec in _book_records(lang, book, data, served)),
+                    mimetype="application/x-ndjson")
+    resp.set_etag(f"{tag}-{book}")
+    resp.headers["Cache-Control"] = "public, max-age=3600"
+    return resp
+
+# ----------------------------
+# Delta sync for offline clients: /api/manifest and /api/delta
+# ----------------------------
+# A manifest maps "<book>/<chapter>" to a hash of that chapter's content
+# (verses + intro). Every manifest we hand out is also written to
+# instance/manifests/<lang>/<hash>.json so a client holding an older manifest
+# hash can later be told exactly which chapters changed.
+_MANIFEST_CACHE = {}   # { lang: { "tag": source tag, "manifest": {...} } }
+
+def _content_hash(obj) -> str:
+    raw = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def _manifest_dir(lang: str):
+    path = os.path.join(app.instance_path, "manifests", lang)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _get_manifest(lang: str):
+    served, data = _resolve_lang(lang)   # stubs sync their fallback's text
+    if not data:
+        return None
+    tag = _source_tag(sorted({lang, served}))
+    hit = _MANIFEST_CACHE.get(lang)
+    if hit and hit["tag"] == tag:
+        return hit["manifest"]
+
+    chapters = {}
+    for slug in BOOK_SLUGS:
+        book_chapters = data.get(slug, {}).get("chapters", {})
+        for n in range(1, BOOK_CHAPTERS[slug] + 1):
+            chapters[f"{slug}/{n}"] = _content_hash(book_chapters.get(str(n)) or {})
+    manifest = {"lang": lang, "hash": _content_hash(chapters), "chapters": chapters}
+    if served != lang:
+        manifest["servedLang"] = served
+
+    path = os.path.join(_manifest_dir(lang), f"{manifest['hash']}.json")
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(chapters, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    _MANIFEST_CACHE[lang] = {"tag": tag, "manifest": manifest}
+    return manifest
+
+def _old_manifest_chapters(lang: str, manifest_hash: str):
+    if not re.fullmatch(r"[0-9a-f]{16}", manifest_hash or ""):
+        return None
+    path = os.path.join(_manifest_dir(lang), f"{manifest_hash}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+@app.get("/api/manifest")
+def api_manifest():
+    lang = _clean_lang(request.args.get("lang", "").strip())
+    if not lang:
+        return jsonify({"error": "Missing 'lang' parameter"}), 400
+    manifest = _get_manifest(lang)
+    if not manifest:
+        return jsonify({"error": f"Language '{lang}' not found"}), 404
+    resp = jsonify(manifest)
+    resp.set_etag(manifest["hash"])
+    return resp.make_conditional(request)
+
+@app.get("/api/delta")
+def api_delta():
+    """Chapters that changed since the client's manifest hash (everything if the hash is unknown)."""
+    lang = _clean_lang(request.args.get("lang", "").strip())
+    since = request.args.get("since", "").strip()
+    if not lang:
+        return jsonify({"error": "Missing 'lang' parameter"}), 400
+    manifest = _get_manifest(lang)
+    if not manifest:
+        return jsonify({"error": f"Language '{lang}' not found"}), 404
+
+    current = manifest["chapters"]
+    old = current if since == manifest["hash"] else _old_manifest_chapters(lang, since)
+    full = old is None
+    changed_keys = [k for k, h in current.items() if full or old.get(k) != h]
+    removed = [] if full else [k for k in old if k not in current]
+
+    data = _resolve_lang(lang)[1] or {}
+    changed = []
+    for key in changed_keys:
+        slug, n = key.split("/")
+        content = data.get(slug, {}).get("chapters", {}).get(n) or {}
+        changed.append({
+            "book": slug, "chapter": n, "hash": current[key],
+            "intro": content.get("intro", ""),
+            "verses": _chapter_verses(content),
+        })
+    payload = {
+        "lang": lang, "since": since, "hash": manifest["hash"],
+        "full": full, "changed": changed, "removed": removed,
+    }
+    if "servedLang" in manifest:
+        payload["servedLang"] = manifest["servedLang"]
+    return jsonify(payload)
+
+# ----------------------------
+# Memory accounting for the corpus caches (admin + tools/memory_report.py)
+# ----------------------------
+def _deep_size(obj, seen: set, acc: dict):
+    """Adds obj's footprint to acc (bytes / strings / str_bytes / utf8_bytes / containers); shared objects count once."""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size = sys.getsizeof(o)
+        acc["bytes"] += size
+        if isinstance(o, str):
+            acc["strings"] += 1
+            acc["str_bytes"] += size
+            acc["utf8_bytes"] += len(o.encode("utf-8", "surrogatepass"))
+        elif isinstance(o, dict):
+            acc["containers"] += size
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            acc["containers"] += size
+            stack.extend(o)
+
+def _new_acc():
+    return {"bytes": 0, "strings": 0, "str_bytes": 0, "utf8_bytes": 0, "containers": 0}
+
+def _trace_cold_load(lang: str, top: int = 10):
+    """
+    Parses all_books/<lang>.json under tracemalloc (bypassing the caches) and returns the top allocators.
+    If the language is already cached, interning reuses its strings, so run this before loading it.
+    """
+    import tracemalloc
+    path = os.path.join(BASE_DIR, "all_books", f"{_clean_lang(lang)}.json")
+    if not os.path.exists(path):
+        return None
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        t0 = time.perf_counter()
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = _intern_strings(json.loads(raw.decode("utf-8")))
+        elapsed = time.perf_counter() - t0
+        _current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    stats = after.compare_to(before, "lineno")[:top]
+    del data
+    return {
+        "lang": lang,
+        "file_bytes": len(raw),
+        "seconds": round(elapsed, 4),
+        "peak_traced_bytes": peak,
+        "top": [{"where": str(st.traceback[0]), "size_diff": st.size_diff, "count_diff": st.count_diff}
+                for st in stats],
+    }
+
+def _memory_report(trace_lang: str = ""):
+    corpus = _corpus()
+    seen = set()
+    langs = {}
+    # Cached languages; later aliases of byte-identical files add nothing ("shared").
+    for lang, data in list(corpus.files.items()):
+        own = _new_acc()
+        _deep_size(data, set(), own)
+        incremental = _new_acc()
+        _deep_size(data, seen, incremental)
+        langs[lang] = {
+            "digest": corpus.digests.get(lang, "")[:12],
+            "deep_bytes": own["bytes"],
+            "incremental_bytes": incremental["bytes"],
+            "strings": own["strings"],
+            "str_object_bytes": own["str_bytes"],
+            "utf8_bytes": own["utf8_bytes"],
+            "container_bytes": own["containers"],
+            "overhead_ratio": round(own["bytes"] / own["utf8_bytes"], 2) if own["utf8_bytes"] else None,
+        }
+    caches = {}
+    for name, obj in (("_BOOKS_CACHE", _BOOKS_CACHE), ("_CHAPTER_CACHE", _CHAPTER_CACHE),
+                      ("_ALIGN_CACHE", _ALIGN_CACHE), ("_RELATED_CACHE", _RELATED_CACHE),
+                      ("_MANIFEST_CACHE", _MANIFEST_CACHE),
+                      ("METADATA_INDEX", corpus.index), ("BOOKS_NAMES", corpus.names),
+                      ("AVAILABILITY", corpus.availability.langs)):
+        acc = _new_acc()
+        _deep_size(obj, set(), acc)
+        caches[name] = {"entries": len(obj), "deep_bytes": acc["bytes"]}
+    report = {
+        "pid": os.getpid(),
+        "corpus_version": corpus.version,
+        "loader": _loader_stats(),
+        "languages": langs,
+        "corpus_total_bytes": sum(l["incremental_bytes"] for l in langs.values()),
+        "caches": caches,
+    }
+    if trace_lang:
+        report["cold_load"] = _trace_cold_load(trace_lang)
+    return report
+
+@app.get("/api/admin/memory")
+@admin_required
+def api_admin_memory():
+    """Per-language memory accounting for this worker; ?trace=<lang> adds a tracemalloc'd cold load."""
+    return jsonify(_memory_report(_clean_lang(request.args.get("trace", "").strip())))
+
+# ----------------------------
+# Reference resolver: /api/resolve?q=Mosia 4 9
+# ----------------------------
+# A prefix trie over every language's localized book names (metadata index +
+# booksnames.json), slugs and common abbreviations, built once at startup.
+# Keys are casefolded, diacritic-folded and digit-normalized, so "mosia",
+# "Mosíah" and "MOSIAH" meet; each node keeps its best few entries so
+# autocomplete is a walk down the query plus a slice.
+BOOK_ABBREVIATIONS = {
+    "1-ne": ["1 Ne"], "2-ne": ["2 Ne"], "jacob": ["Jac"], "enos": [], "jarom": [], "omni": [],
+    "w-of-m": ["W of M", "WofM"], "mosiah": ["Mos"], "alma": [], "hel": ["Hel"], "3-ne": ["3 Ne"],
+    "4-ne": ["4 Ne"], "morm": ["Morm"], "ether": ["Eth"], "moro": ["Moro"],
+}
+RESOLVER_NODE_TOP = 12
+
+def _fold(text: str) -> str:
+    """Casefold, strip diacritics, map any decimal digit to ASCII, punctuation -> single spaces."""
+    out = []
+    for ch in unicodedata.normalize("NFKD", text.casefold()):
+        if unicodedata.category(ch) == "Mn":
+            continue
+        d = unicodedata.decimal(ch, None)
+        if d is not None:
+            out.append(str(d))
+        elif ch.isalnum():
+            out.append(ch)
+        else:
+            out.append(" ")
+    return " ".join("".join(out).split())
+
+class _TrieNode:
+    __slots__ = ("children", "top", "exact")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []      # best entry ids under this prefix
+        self.exact = []    # entry ids whose key ends here
+
+class _BookResolver:
+    def __init__(self):
+        self.root = _TrieNode()
+        self.entries = []   # [{"book", "name", "langs", "names": {lang: spelling}}]
+        self._by_key = {}   # (folded key, slug) -> entry id
+
+    def _add(self, key: str, slug: str, name: str, lang: str):
+        if not key:
+            return
+        eid = self._by_key.get((key, slug))
+        if eid is None:
+            eid = len(self.entries)
+            self._by_key[(key, slug)] = eid
+            self.entries.append({"book": slug, "name": name, "langs": [], "names": {}})
+            node = self.root
+            for ch in key:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.top.append(eid)
+            node.exact.append(eid)
+        e = self.entries[eid]
+        if lang and lang not in e["langs"]:
+            e["langs"].append(lang)
+            e["names"][lang] = name   # "Mosias" (por) and "Mosiáš" (ces) share a folded key
+
+    def add_name(self, name: str, slug: str, lang: str):
+        name = re.sub(r"\d+$", "", name.strip()).strip()   # crawl artifacts like "モーサヤ書1"
+        key = _fold(name)
+        self._add(key, slug, name, lang)
+        if " " in key:
+            self._add(key.replace(" ", ""), slug, name, lang)   # "1nefi", "wofm"
+
+    def finish(self):
+        """Ranks each node's entries: more languages first, then shorter names, then canon order."""
+        order = {slug: i for i, slug in enumerate(BOOK_SLUGS)}
+        rank = {eid: (-len(e["langs"]), len(e["name"]), order[e["book"]]) for eid, e in enumerate(self.entries)}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            node.top = sorted(set(node.top), key=rank.__getitem__)[:RESOLVER_NODE_TOP]
+            node.exact.sort(key=rank.__getitem__)
+            stack.extend(node.children.values())
+
+    def _node(self, key: str):
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, key: str, lang: str = "", limit: int = 8):
+        node = self._node(key)
+        if node is None:
+            return []
+        ids = node.exact + [i for i in node.top if i not in node.exact]
+        if lang:
+            ids.sort(key=lambda i: lang not in self.entries[i]["langs"])   # stable: keeps rank otherwise
+        out, seen = [], set()
+        for i in ids:
+            e = self.entries[i]
+            name = e["names"].get(lang, e["name"])   # the requested language's spelling when it has one
+            if (e["book"], name) in seen:
+                continue
+            seen.add((e["book"], name))
+            out.append({"book": e["book"], "name": name, "langs": e["langs"]})
+            if len(out) >= limit:
+                break
+        return out
+
+def _build_resolver(names: dict, index: dict):
+    r = _BookResolver()
+    for slug in BOOK_SLUGS:
+        r.add_name(slug.replace("-", " "), slug, "")
+        for abbr in BOOK_ABBREVIATIONS.get(slug, []):
+            r.add_name(abbr, slug, "")
+    sources = [(lang, {b["abbr"]: b["name"] for b in entry.get("books", [])}) for lang, entry in index.items()]
+    sources += [(lang, {k: v for k, v in by_slug.items() if k in BOOK_CHAPTERS}) for lang, by_slug in names.items()]
+    for lang, names in sources:
+        # a name shared by several books of one language is a crawl error (e.g. a generic title)
+        counts = {}
+        for name in names.values():
+            counts[name] = counts.get(name, 0) + 1
+        for slug, name in names.items():
+            if name and counts[name] == 1 and name != slug:
+                r.add_name(name, slug, lang)
+    r.finish()
+    return r
+
+_CORPUS.resolver = _build_resolver(_CORPUS.names, _CORPUS.index)
+
+def _split_reference(folded: str):
+    """'mosia 4 9' -> ('mosia', 4, 9); trailing numbers may also be glued to the name ('尼腓一書3')."""
+    tokens = folded.split()
+    nums = []
+    while tokens and len(nums) < 2:
+        last = tokens[-1]
+        if last.isdigit() and len(tokens) > 1:
+            nums.insert(0, int(tokens.pop()))
+            continue
+        m = re.match(r"^(.*\D)(\d+)$", last)
+        if m:
+            tokens[-1] = m.group(1)
+            nums.insert(0, int(m.group(2)))
+        break
+    chapter = nums[0] if nums else None
+    verse = nums[1] if len(nums) > 1 else None
+    return " ".join(tokens), chapter, verse
+
+@app.get("/api/resolve")
+def api_resolve():
+    """
+    Free-text reference in any language -> (book slug, chapter, verse).
+      /api/resolve?q=Mosia 4 9[&lang=por]
+      /api/resolve?q=mos&mode=complete[&lang=por][&limit=8]   -> ranked candidates
+    """
+    q = request.args.get("q", "")
+    lang = _clean_lang(request.args.get("lang", "").strip())
+    if not q.strip():
+        return jsonify({"error": "Missing 'q' parameter"}), 400
+    name, chapter, verse = _split_reference(_fold(q))
+    resolver = _corpus().resolver
+
+    if request.args.get("mode") == "complete":
+        limit = max(1, min(request.args.get("limit", 8, type=int) or 8, 25))
+        cands = resolver.complete(name, lang, limit)
+        if not cands and " " in name:
+            cands = resolver.complete(name.replace(" ", ""), lang, limit)
+        return jsonify({"q": q, "chapter": chapter, "verse": verse, "candidates": [
+            {"book": c["book"], "name": c["name"], "langs": c["langs"][:5]} for c in cands
+        ]})
+
+    cands = resolver.complete(name, lang, 8) or resolver.complete(name.replace(" ", ""), lang, 8)
+    if not cands:
+        return jsonify({"error": f"No book matches '{q}'", "q": q}), 404
+    books = list(dict.fromkeys(c["book"] for c in cands))
+    best = cands[0]
+    if chapter is not None and not 1 <= chapter <= BOOK_CHAPTERS[best["book"]]:
+        return jsonify({"error": f"{best['name']} has {BOOK_CHAPTERS[best['book']]} chapters", "q": q,
+                        "book": best["book"]}), 404
+    return jsonify({
+        "q": q, "book": best["book"], "name": best["name"],
+        "chapter": chapter, "verse": verse,
+        "ambiguous": len(books) > 1,
+        "alternatives": books[1:],
+    })
+
+# ----------------------------
+# Corpus hot reload
+# ----------------------------
+# Every CORPUS_RELOAD_SECONDS a background thread re-stats the files the
+# current corpus version has read (all_books/*.json, booksnames.json,
+# metadata_index.json, verse_availability.json, derived/ tables). If any
+# changed, it re-parses the changed languages that were loaded, re-reads
+# names/index (and rebuilds the resolver), then swaps _CORPUS in a single
+# assignment. Requests already
+# running keep the version they pinned; ETags move with the new stamps, and
+# the version-keyed caches (_BOOKS_CACHE, _CHAPTER_CACHE via its tag) miss
+# once. Files nobody has loaded yet are simply read fresh on first use.
+CORPUS_RELOAD_SECONDS = float(os.environ.get("CORPUS_RELOAD_SECONDS", "10"))   # 0 disables the watcher
+_CORPUS_LOCK = threading.Lock()   # one rebuild at a time (watcher vs. /api/admin/reload)
+
+def _reload_corpus():
+    """Builds and swaps in a new corpus version if any file the current one read has changed."""
+    global _CORPUS
+    with _CORPUS_LOCK:
+        old = _CORPUS
+        changed = {}
+        for path, stamp in list(old.stamps.items()):
+            now = _file_stamp(path)
+            if now != stamp:
+                changed[path] = now
+        if not changed:
+            return {"version": old.version, "changed": [], "failed": []}
+
+        t0 = time.perf_counter()
+        new = _Corpus(old.version + 1, old.names, old.index,
+                      files=dict(old.files), digests=dict(old.digests), stamps=dict(old.stamps))
+        new.availability = old.availability
+        book_dir = os.path.join(BASE_DIR, "all_books")
+        failed = []
+        for path, stamp in changed.items():
+            try:
+                if path == BOOKSNAMES_PATH:
+                    new.names = _read_json(path) if stamp else {}
+                elif path == METADATA_INDEX_PATH:
+                    new.index = _read_json(path).get("languages", {}) if stamp else {}
+                elif path == AVAILABILITY_PATH:
+                    new.availability = _Availability(_read_json(path) if stamp else {})
+                elif os.path.dirname(path) == book_dir:
+                    lang = os.path.basename(path)[:-len(".json")]
+                    if stamp and lang in old.files:
+                        with open(path, "rb") as f:
+                            st = os.fstat(f.fileno())
+                            raw = f.read()
+                        stamp = (st.st_mtime_ns, st.st_size)
+                        new.digests[lang], new.files[lang] = _parse_book_file(raw, old.contents)
+                    else:
+                        new.files.pop(lang, None)   # deleted, or never loaded: read on first use
+                        new.digests.pop(lang, None)
+                    _LOAD_FAILURES.pop(lang, None)   # e.g. a corrupt file that has been fixed
+                elif os.path.dirname(path) == os.path.join(DERIVED_DIR, "align"):
+                    src, dst = os.path.basename(path).split(".")[:2]
+                    _ALIGN_CACHE.pop((src, dst), None)   # next request reads the rebuilt table
+                else:
+                    _RELATED_CACHE.pop(os.path.basename(path)[:-len(".json")], None)
+            except Exception as e:
+                # Most likely caught mid-write: keep serving the old version, retry next tick.
+                app.logger.error("Corpus reload: %s: %s", path, e)
+                failed.append(path)
+                continue
+            new.stamps[path] = stamp
+        new.contents = {d: new.files[l] for l, d in new.digests.items()}
+        new.resolver = (_build_resolver(new.names, new.index)
+                        if new.names is not old.names or new.index is not old.index else old.resolver)
+
+        done = [os.path.relpath(p, BASE_DIR) for p in changed if p not in failed]
+        failed = [os.path.relpath(p, BASE_DIR) for p in failed]
+        if not done:
+            return {"version": old.version, "changed": [], "failed": failed}
+        _CORPUS = new
+    seconds = time.perf_counter() - t0
+    app.logger.info("Corpus v%s: reloaded %s in %.2fs", new.version, ", ".join(done), seconds)
+    return {"version": new.version, "changed": done, "failed": failed, "seconds": round(seconds, 3)}
+
+class _CorpusWatcher:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def ensure_started(self):
+        _ensure_daemon(self, self._run, "corpus-watcher")
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                _reload_corpus()
+            except Exception as e:
+                app.logger.error("Corpus reload failed: %s", e)
+
+if CORPUS_RELOAD_SECONDS > 0:
+    _CORPUS_WATCHER = _CorpusWatcher(CORPUS_RELOAD_SECONDS)
+
+    @app.before_request
+    def _start_corpus_watcher():
+        _CORPUS_WATCHER.ensure_started()
+
+@app.post("/api/admin/reload")
+@admin_required
+def api_admin_reload():
+    """Checks the corpus files now instead of waiting for the watcher (e.g. from a deploy script)."""
+    return jsonify(_reload_corpus())
+
+# ----------------------------
+# Warm-up & readiness: /readyz
+# ----------------------------
+# A fresh worker parses languages in the background, in priority order, and
+# pre-encodes their hot chapters into _CHAPTER_CACHE, so the first readers
+# after a deploy don't pay for json.load. Priority: WARMUP_LANGS first, then
+# the most requested languages in the access log (WARMUP_ACCESS_LOG, default
+# ACCESS_LOG_PATH). /readyz answers 503 until the WARMUP_LANGS are done;
+# learned languages keep warming after that. /healthz stays a pure liveness check.
+WARMUP_LANGS = [l.strip() for l in os.environ.get("WARMUP_LANGS", "eng,por,spa").split(",") if l.strip()]
+WARMUP_MAX_LANGS = int(os.environ.get("WARMUP_MAX_LANGS", "8"))           # configured + learned
+WARMUP_CHAPTERS = int(os.environ.get("WARMUP_CHAPTERS", "40"))            # hot chapters per language
+WARMUP_ACCESS_LOG = os.environ.get("WARMUP_ACCESS_LOG", ACCESS_LOG_PATH)
+WARMUP_LOG_BYTES = int(os.environ.get("WARMUP_LOG_BYTES", str(8 * 1024 * 1024)))   # tail of the log to read
+WARMUP_READY_TIMEOUT = float(os.environ.get("WARMUP_READY_TIMEOUT", "120"))  # report ready anyway after this
+
+def _traffic_profile(path: str, max_bytes: int):
+    """({lang: requests}, {lang: {(book, chapter): requests}}) from the tail of an access log."""
+    langs, chapters = {}, {}
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - max_bytes))
+            lines = f.read().decode("utf-8", "replace").splitlines()[1:]   # first line may be cut
+    except OSError:
+        return langs, chapters
+    for line in lines:
+        try:
+            rec = json.loads(line)
+            params = rec.get("params") or {}
+        except (ValueError, AttributeError):
+            continue
+        for l in [params.get("lang"), params.get("pair")] + (params.get("langs") or "").split(","):
+            l = _clean_lang((l or "").strip())
+            if l:
+                langs[l] = langs.get(l, 0) + 1
+        if rec.get("route") == "/api/chapter" and params.get("book") in BOOK_CHAPTERS:
+            key = (params["book"], str(params.get("chapter", "")))
+            by_lang = chapters.setdefault(_clean_lang(params.get("lang", "por")), {})
+            by_lang[key] = by_lang.get(key, 0) + 1
+    return langs, chapters
+
+class _Warmup:
+    def __init__(self, langs, max_langs: int, chapters: int, log_path: str, ready_timeout: float):
+        self.max_langs = max_langs
+        self.chapters = chapters
+        self.log_path = log_path
+        self.ready_timeout = ready_timeout
+        self.required = [l for l in dict.fromkeys(_clean_lang(l) for l in langs) if l]   # gate /readyz
+        self.plan = []          # languages in warm-up order
+        self.done = []          # languages warmed so far
+        self.encoded = 0        # chapter bodies put in _CHAPTER_CACHE
+        self.started_at = None
+        self.ready_at = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Idempotent; called from gunicorn's post_worker_init and, as a fallback, the first request.
+        A no-op in workers forked from a master that already ran run_now()."""
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.started_at = time.time()
+                    self.thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+                    self.thread.start()
+
+    def run_now(self):
+        """Warm synchronously in the calling thread. gunicorn's master calls this when preload_app is
+        on, so every forked worker starts warm and ready, and start() in the worker is a no-op."""
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.started_at = time.time()
+            self.thread = threading.current_thread()
+        self._run()
+
+    def ready(self) -> bool:
+        if self.ready_at is not None:
+            return True
+        return self.started_at is not None and time.time() - self.started_at > self.ready_timeout
+
+    def _plan(self, learned):
+        plan = list(self.required)
+        for lang, _n in sorted(learned.items(), key=lambda kv: -kv[1]):
+            if len(plan) >= self.max_langs:
+                break
+            if lang not in plan and os.path.exists(os.path.join(BASE_DIR, "all_books", f"{lang}.json")):
+                plan.append(lang)
+        return plan
+
+    def _hot_chapters(self, counts):
+        """Most requested chapters, or the first chapter of every book when there is no traffic yet."""
+        ranked = [k for k, _n in sorted(counts.items(), key=lambda kv: -kv[1])
+                  if k[1].isdigit() and 1 <= int(k[1]) <= BOOK_CHAPTERS[k[0]]]
+        return ranked[:self.chapters] if ranked else [(slug, "1") for slug in BOOK_SLUGS]
+
+    def _warm_lang(self, lang, hot):
+        _get_books_for_lang(lang)
+        served, data = _resolve_lang(lang)
+        if not data:
+            return
+        tag = _source_tag(sorted({lang, served}))
+        for book, chapter in hot:
+            key = (lang, book, chapter)
+            if _chapter_cache_get(key, tag) is not None:
+                continue
+            content = data.get(book, {}).get("chapters", {}).get(chapter)
+            if content:
+                _chapter_cache_put(key, tag, _chapter_body(content, book, chapter, lang, served))
+                self.encoded += 1
+
+    def _run(self):
+        t0 = time.perf_counter()
+        learned, chapters = _traffic_profile(self.log_path, WARMUP_LOG_BYTES) if self.log_path else ({}, {})
+        self.plan = self._plan(learned)
+        with app.app_context():
+            for lang in self.plan:
+                try:
+                    self._warm_lang(lang, self._hot_chapters(chapters.get(lang, {})))
+                except Exception as e:
+                    app.logger.error("Warm-up of %s failed: %s", lang, e)
+                self.done.append(lang)
+                if self.ready_at is None and set(self.required).issubset(self.done):
+                    self.ready_at = time.time()
+                    app.logger.info("Warm-up: ready after %.2fs (%s)", time.perf_counter() - t0, ", ".join(self.done))
+        self.ready_at = self.ready_at or time.time()
+        app.logger.info("Warm-up: %d languages, %d chapters in %.2fs",
+                        len(self.done), self.encoded, time.perf_counter() - t0)
+
+    def status(self):
+        return {
+            "ready": self.ready(),
+            "warmed": list(self.done),
+            "pending": [l for l in self.plan if l not in self.done],
+            "chapters": self.encoded,
+            "seconds": round((self.ready_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            "corpusVersion": _corpus().version,
+        }
+
+_WARMUP = _Warmup(WARMUP_LANGS, WARMUP_MAX_LANGS, WARMUP_CHAPTERS, WARMUP_ACCESS_LOG, WARMUP_READY_TIMEOUT)
+
+@app.before_request
+def _start_warmup():
+    _WARMUP.start()
+
+@app.get("/readyz")
+def readyz():
+    status = _WARMUP.status()
+    return jsonify(status), (200 if status["ready"] else 503)
+
 if __name__ == '__main__':
     # Render/Heroku/etc. set PORT in the environment
     port = int(os.getenv("PORT", "5050"))
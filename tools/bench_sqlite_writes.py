@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Write-concurrency benchmark for the users database.
+
+Spawns N processes (standing in for gunicorn workers) that hammer one SQLite
+file with the auth routes' access pattern: mostly "SELECT user by email"
+plus signups (INSERT) and verify/reset (UPDATE), one transaction each.
+Runs once with SQLite defaults and once with the settings server.py applies
+(WAL, busy_timeout, synchronous=NORMAL), then prints throughput, latency and
+how many operations failed with "database is locked".
+
+Usage:
+  python tools/bench_sqlite_writes.py --workers 4 --seconds 10 --write-ratio 0.3
+"""
+
+import argparse, multiprocessing as mp, os, random, sqlite3, sys, tempfile, time
+
+# Keep in sync with _sqlite_pragmas() in server.py. {busy_ms} is --timeout in ms, so
+# both profiles wait on locks for the same time and only the journal/sync settings differ.
+PROFILES = {
+    "default": [],
+    "tuned": ["PRAGMA journal_mode=WAL", "PRAGMA busy_timeout={busy_ms}", "PRAGMA synchronous=NORMAL"],
+}
+
+SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL,
+    email_verified_at DATETIME NULL
+)
+"""
+
+# ---------- worker ----------
+
+def connect(path: str, profile: str, timeout: float) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=timeout)
+    for pragma in PROFILES[profile]:
+        conn.execute(pragma.format(busy_ms=int(timeout * 1000)))
+    return conn
+
+def worker(path: str, profile: str, seconds: float, write_ratio: float, timeout: float, seed: int, out):
+    rnd = random.Random(seed)
+    conn = connect(path, profile, timeout)
+    ok = locked = 0
+    lat = []
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+        t0 = time.perf_counter()
+        try:
+            if rnd.random() < write_ratio:
+                if rnd.random() < 0.5:
+                    conn.execute(
+                        "INSERT INTO users (email, password_hash, created_at) VALUES (?, ?, datetime('now'))",
+                        (f"w{seed}-{n}@example.com", "pbkdf2:sha256$x"),
+                    )
+                else:
+                    conn.execute("UPDATE users SET email_verified_at = datetime('now') WHERE id = ?",
+                                 (rnd.randint(1, 1000),))
+                conn.commit()
+            else:
+                conn.execute("SELECT * FROM users WHERE email = ?",
+                             (f"seed-{rnd.randint(1, 1000)}@example.com",)).fetchone()
+            ok += 1
+            lat.append(time.perf_counter() - t0)
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+            conn.rollback()
+    conn.close()
+    out.put((ok, locked, lat))
+
+# ---------- pipeline ----------
+
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * p))]
+
+def run_profile(profile: str, workers: int, seconds: float, write_ratio: float, timeout: float) -> None:
+    d = tempfile.mkdtemp(prefix="bench-users-")
+    path = os.path.join(d, "users.db")
+    conn = connect(path, profile, timeout)
+    conn.execute(SCHEMA)
+    conn.executemany("INSERT INTO users (email, password_hash, created_at) VALUES (?, 'x', datetime('now'))",
+                     [(f"seed-{i}@example.com",) for i in range(1, 1001)])
+    conn.commit()
+    conn.close()
+
+    out = mp.Queue()
+    procs = [mp.Process(target=worker, args=(path, profile, seconds, write_ratio, timeout, i, out))
+             for i in range(workers)]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    ok = sum(r[0] for r in results)
+    locked = sum(r[1] for r in results)
+    lat = sorted(x for r in results for x in r[2])
+    print(f"{profile:8s} {ok / seconds:9.0f} ops/s   p50 {percentile(lat, .5) * 1000:7.2f} ms   "
+          f"p99 {percentile(lat, .99) * 1000:7.2f} ms   locked errors {locked}")
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=4, help="Concurrent processes (default: 4)")
+    ap.add_argument("--seconds", type=float, default=10, help="Duration per profile (default: 10)")
+    ap.add_argument("--write-ratio", type=float, default=0.3, help="Share of writes (default: 0.3)")
+    ap.add_argument("--timeout", type=float, default=5.0,
+                    help="Lock timeout, seconds: sqlite3 connect() timeout and the tuned busy_timeout "
+                         "(default: 5.0, the driver default)")
+    ap.add_argument("--profiles", default="default,tuned", help="Comma-separated profiles to run")
+    args = ap.parse_args()
+
+    print(f"{args.workers} workers, {args.seconds:g}s, write ratio {args.write_ratio:g}", file=sys.stderr)
+    for profile in [p.strip() for p in args.profiles.split(",") if p.strip()]:
+        run_profile(profile, args.workers, args.seconds, args.write_ratio, args.timeout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Builds word translation candidates between language pairs from the
+verse-aligned corpus in all_books/*.json.
+
+Every verse present in both languages is one "sentence pair". We build binary
+verse x word matrices for each side, multiply them (sparse) to get word
+co-occurrence counts, score each pair with the Dice coefficient and keep the
+top-k candidates per word. Both directions are written from the same counts.
+
+Output (one file per direction):
+  derived/align/<src>.<dst>.json
+  {
+    "src": "eng", "dst": "por", "verses": 6604,
+    "vocab": ["<dst word>", ...],                 # only words referenced below
+    "words": { "<src word>": [[<vocab idx>, <dice x 1000>], ...], ... }
+  }
+
+Usage:
+  python tools/build_alignment.py --pairs eng:por,eng:spa
+  python tools/build_alignment.py --pairs eng:por --topk 8 --min-count 3
+"""
+
+import argparse, json, os, re, sys, time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from build_metadata_index import verse_number
+
+BOOK_SLUGS = [
+    "1-ne", "2-ne", "jacob", "enos", "jarom", "omni",
+    "w-of-m", "mosiah", "alma", "hel", "3-ne", "4-ne", "morm", "ether", "moro",
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ---------- helpers ----------
+
+# Keep in sync with _tokenize() in server.py (verse hints reuse these tables).
+# CJK ideographs / kana are single tokens; everything else is a run of letters
+# plus the combining marks that Indic, Arabic, Hebrew, Thai, ... words need.
+_TOKEN_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]"
+    r"|(?:[^\W\d_]|[\u0300-\u036f\u0483-\u0489\u0591-\u05c7\u0610-\u061a"
+    r"\u064b-\u065f\u0670\u0900-\u0dff\u0e00-\u0eff\u1000-\u109f])+"
+)
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+def load_verses(lang: str) -> Dict[str, str]:
+    """{ "<book>/<chapter>/<verse number>": text } for every non-empty numbered verse.
+
+    Numbers are normalized ("12.", native digits, Ethiopic numerals), so languages
+    that key verses differently still pair up.
+    """
+    path = os.path.join(ROOT, "all_books", f"{lang}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    out = {}
+    for slug in BOOK_SLUGS:
+        chapters = data.get(slug, {}).get("chapters", {})
+        for ch, content in chapters.items():
+            for key, text in content.items():
+                n = verse_number(key) if key != "intro" else None
+                if n and text:
+                    out[f"{slug}/{ch}/{n}"] = text
+    return out
+
+def verse_matrix(texts: List[str]) -> Tuple[sparse.csr_matrix, List[str]]:
+    """Binary verse x word matrix (a word counts once per verse)."""
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, text in enumerate(texts):
+        for tok in set(tokenize(text)):
+            rows.append(i)
+            cols.append(vocab.setdefault(tok, len(vocab)))
+    data = np.ones(len(rows), dtype=np.float32)
+    m = sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(vocab)))
+    words = [None] * len(vocab)
+    for w, j in vocab.items():
+        words[j] = w
+    return m, words
+
+def top_candidates(counts: sparse.coo_matrix, f_row: np.ndarray, f_col: np.ndarray,
+                   min_count: int, topk: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Dice-score every co-occurring pair and keep the best `topk` per row."""
+    keep = counts.data >= min_count
+    r, c, n = counts.row[keep], counts.col[keep], counts.data[keep]
+    dice = 2.0 * n / (f_row[r] + f_col[c])
+    # sort by row, then best score first; rank within each row via run starts
+    order = np.lexsort((-dice, r))
+    r, c, dice = r[order], c[order], dice[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(r)) + 1]
+    run_start = np.repeat(starts, np.diff(np.r_[starts, len(r)]))
+    sel = (np.arange(len(r)) - run_start) < topk
+    return r[sel], c[sel], dice[sel]
+
+def table(src: str, dst: str, n_verses: int, src_words: List[str], dst_words: List[str],
+          r: np.ndarray, c: np.ndarray, score: np.ndarray) -> dict:
+    vocab_idx: Dict[int, int] = {}
+    words: Dict[str, List[List[int]]] = {}
+    for i, j, s in zip(r.tolist(), c.tolist(), np.rint(score * 1000).astype(int).tolist()):
+        k = vocab_idx.setdefault(j, len(vocab_idx))
+        words.setdefault(src_words[i], []).append([k, s])
+    vocab = [None] * len(vocab_idx)
+    for j, k in vocab_idx.items():
+        vocab[k] = dst_words[j]
+    return {"src": src, "dst": dst, "verses": n_verses, "vocab": vocab, "words": words}
+
+def write_json(path: str, payload: dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+# ---------- pipeline ----------
+
+def build_pair(src: str, dst: str, out_dir: str, min_count: int, topk: int) -> None:
+    started = time.time()
+    a, b = load_verses(src), load_verses(dst)
+    keys = [k for k in a if k in b]
+    if not keys:
+        print(f"[skip] {src}:{dst}: no verses in common", file=sys.stderr)
+        return
+
+    xs, src_words = verse_matrix([a[k] for k in keys])
+    xd, dst_words = verse_matrix([b[k] for k in keys])
+    counts = (xs.T.tocsr() @ xd).tocoo()
+    fs = np.asarray(xs.sum(axis=0)).ravel()
+    fd = np.asarray(xd.sum(axis=0)).ravel()
+
+    r, c, s = top_candidates(counts, fs, fd, min_count, topk)
+    write_json(os.path.join(out_dir, f"{src}.{dst}.json"),
+               table(src, dst, len(keys), src_words, dst_words, r, c, s))
+
+    rev = sparse.coo_matrix((counts.data, (counts.col, counts.row)), shape=counts.shape[::-1])
+    r, c, s = top_candidates(rev, fd, fs, min_count, topk)
+    write_json(os.path.join(out_dir, f"{dst}.{src}.json"),
+               table(dst, src, len(keys), dst_words, src_words, r, c, s))
+
+    print(f"{src}<->{dst}: {len(keys)} verses, {len(src_words)}x{len(dst_words)} words, "
+          f"{counts.nnz} pairs in {time.time() - started:.1f}s", file=sys.stderr)
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", required=True, help="Comma-separated src:dst pairs (e.g., eng:por,eng:spa)")
+    ap.add_argument("--out-dir", default=os.path.join(ROOT, "derived", "align"), help="Output directory")
+    ap.add_argument("--topk", type=int, default=5, help="Candidates kept per word (default: 5)")
+    ap.add_argument("--min-count", type=int, default=2, help="Minimum verse co-occurrences (default: 2)")
+    args = ap.parse_args()
+
+    pairs = [p.split(":", 1) for p in args.pairs.split(",") if ":" in p]
+    if not pairs:
+        raise SystemExit("No src:dst pairs given.")
+    for src, dst in pairs:
+        build_pair(src.strip(), dst.strip(), args.out_dir, args.min_count, args.topk)
+
+if __name__ == "__main__":
+    main()
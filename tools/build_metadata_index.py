@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Builds metadata_index.json: everything /api/books needs for every language,
+without any verse text, so the server never parses a multi-MB corpus file
+just to list book names.
+
+Derived from all_books/*.json and merged with booksnames.json (used for
+languages whose files are missing or carry slug placeholders as names).
+
+  {
+    "languages": {
+      "eng": {
+        "sha1": "...", "size": 1606464, "aliasOf": null,
+        "chapterWord": "Chapter", "available": true, "verses": 6604,
+        "books": [ { "abbr": "1-ne", "name": "The First Book of Nephi",
+                     "chapters": 22, "chaptersAvailable": 22, "verses": 618 }, ... ]
+      }, ...
+    }
+  }
+
+"aliasOf" names an earlier language whose file is byte-identical.
+
+It also writes verse_availability.json: one bitmap per language over a global
+verse space, so the server can tell a missing or partial chapter apart
+without loading the language.
+
+  {
+    "space": { "chapters": { "1-ne": [20, 24, ...], ... } },   # highest verse number per chapter
+    "bitmaps": { "<id>": "<base64>", ... },                    # identical bitmaps stored once
+    "languages": { "cym": { "bitmap": "<id>", "size": 123456, "verses": 114 }, ... }
+  }
+
+Slots run book by book (BOOK_SLUGS order), chapter by chapter; chapter c of a
+book takes max+1 slots: slot 0 is unnumbered chapter text (verse key "0"),
+slot v is verse v. Bit i lives in byte i // 8 under mask 1 << (i % 8).
+"size" is the corpus file size the bitmap was built from; the server ignores
+a bitmap whose file has since changed size.
+
+Usage:
+  python tools/build_metadata_index.py
+  python tools/build_metadata_index.py --books-dir ./all_books --names ./booksnames.json --out ./metadata_index.json
+"""
+
+import argparse, base64, glob, hashlib, json, os, sys
+from typing import Dict, List, Optional
+
+BOOK_SLUGS = [
+    "1-ne", "2-ne", "jacob", "enos", "jarom", "omni",
+    "w-of-m", "mosiah", "alma", "hel", "3-ne", "4-ne", "morm", "ether", "moro",
+]
+
+BOOK_CHAPTERS = {
+    "1-ne": 22, "2-ne": 33, "jacob": 7, "enos": 1, "jarom": 1, "omni": 1,
+    "w-of-m": 1, "mosiah": 29, "alma": 63, "hel": 16, "3-ne": 30, "4-ne": 1,
+    "morm": 9, "ether": 15, "moro": 10,
+}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ---------- helpers ----------
+
+def default_name(slug: str) -> str:
+    return slug.replace("-", " ").title()
+
+# Keep in sync with _verse_number() in server.py.
+_ETHIOPIC = {chr(0x1369 + i): i + 1 for i in range(9)}             # ፩..፱
+_ETHIOPIC.update({chr(0x1372 + i): (i + 1) * 10 for i in range(9)})  # ፲..፺
+
+def verse_number(key: str) -> Optional[int]:
+    """Verse keys come as "12", "12.", native digits ("١٢", "๑๒") or Ethiopic numerals ("፲፪")."""
+    key = key.strip().rstrip(".")
+    if key.isdecimal():
+        return int(key)   # int() reads any Unicode decimal digits
+    if key and all(ch in _ETHIOPIC or ch == "\u137b" for ch in key):
+        if "\u137b" not in key:                                    # ፻ = 100
+            return sum(_ETHIOPIC[ch] for ch in key)
+        hundreds, _, rest = key.partition("\u137b")
+        return 100 * (sum(_ETHIOPIC[ch] for ch in hundreds) or 1) + sum(_ETHIOPIC[ch] for ch in rest)
+    return None
+
+def chapter_numbers(data: dict) -> Dict[tuple, List[int]]:
+    """{ (slug, chapter): [verse numbers present] } for one language."""
+    out = {}
+    for slug in BOOK_SLUGS:
+        chapters = data.get(slug, {}).get("chapters", {})
+        for n in range(1, BOOK_CHAPTERS[slug] + 1):
+            content = chapters.get(str(n)) or {}
+            nums = [verse_number(k) for k, text in content.items() if k != "intro" and text]
+            out[(slug, n)] = [v for v in nums if v is not None]
+    return out
+
+def build_availability(per_lang: Dict[str, tuple]) -> dict:
+    """per_lang: { lang: (file size, chapter_numbers(...)) } -> verse_availability.json payload."""
+    space = {slug: [0] * BOOK_CHAPTERS[slug] for slug in BOOK_SLUGS}
+    for _size, numbers in per_lang.values():
+        for (slug, n), nums in numbers.items():
+            space[slug][n - 1] = max([space[slug][n - 1]] + nums)
+    offsets, pos = {}, 0
+    for slug in BOOK_SLUGS:
+        for n, top in enumerate(space[slug], 1):
+            offsets[(slug, n)] = pos
+            pos += top + 1
+
+    bitmaps: Dict[str, str] = {}
+    languages = {}
+    for lang, (size, numbers) in sorted(per_lang.items()):
+        bits = bytearray((pos + 7) // 8)
+        total = 0
+        for key, nums in numbers.items():
+            for v in set(nums):
+                i = offsets[key] + v
+                bits[i >> 3] |= 1 << (i & 7)
+                total += 1
+        encoded = base64.b64encode(bytes(bits)).decode("ascii")
+        bid = hashlib.sha1(bits).hexdigest()[:10]
+        bitmaps[bid] = encoded
+        languages[lang] = {"bitmap": bid, "size": size, "verses": total}
+    return {"space": {"chapters": space, "slots": pos}, "bitmaps": bitmaps, "languages": languages}
+
+def language_entry(data: dict, names: Dict[str, str]) -> dict:
+    books = []
+    chapter_word = ""
+    total = 0
+    for slug in BOOK_SLUGS:
+        book = data.get(slug, {})
+        meta = book.get("meta", {})
+        chapters = book.get("chapters", {})
+        verses = 0
+        available = 0
+        for content in chapters.values():
+            n = sum(1 for k in content if k != "intro")
+            verses += n
+            available += 1 if n else 0
+        name = meta.get("name", "")
+        if not name or name == slug or name.startswith("<"):
+            name = names.get(slug) or default_name(slug)
+        chapter_word = chapter_word or meta.get("chapterWord", "")
+        books.append({
+            "abbr": slug, "name": name, "chapters": BOOK_CHAPTERS[slug],
+            "chaptersAvailable": available, "verses": verses,
+        })
+        total += verses
+    return {
+        "chapterWord": names.get("chapter") or chapter_word or "Chapter",
+        "available": total > 0,
+        "verses": total,
+        "books": books,
+    }
+
+# ---------- pipeline ----------
+
+def build(books_dir: str, names_path: str, out_path: str, availability_path: str) -> None:
+    try:
+        with open(names_path, "r", encoding="utf-8") as f:
+            all_names = json.load(f)
+    except Exception:
+        all_names = {}
+
+    languages: Dict[str, dict] = {}
+    seen: Dict[str, str] = {}   # sha1 -> first lang with that content
+    numbers: Dict[str, tuple] = {}
+    for path in sorted(glob.glob(os.path.join(books_dir, "*.json"))):
+        lang = os.path.splitext(os.path.basename(path))[0]
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            print(f"[warn] {lang}: {e}", file=sys.stderr)
+            continue
+        entry = language_entry(data, all_names.get(lang, {}))
+        entry.update({"sha1": digest, "size": len(raw), "aliasOf": seen.get(digest)})
+        seen.setdefault(digest, lang)
+        languages[lang] = entry
+        numbers[lang] = (len(raw), chapter_numbers(data))
+
+    # Languages we only know names for (no corpus file yet)
+    for lang, names in all_names.items():
+        if lang not in languages and isinstance(names, dict):
+            entry = language_entry({}, names)
+            entry.update({"sha1": None, "size": 0, "aliasOf": None})
+            languages[lang] = entry
+
+    write_json(out_path, {"languages": dict(sorted(languages.items()))})
+    n_avail = sum(1 for e in languages.values() if e["available"])
+    print(f"Wrote {out_path}: {len(languages)} languages ({n_avail} with verses).", file=sys.stderr)
+
+    availability = build_availability(numbers)
+    write_json(availability_path, availability)
+    print(f"Wrote {availability_path}: {availability['space']['slots']} verse slots, "
+          f"{len(availability['bitmaps'])} distinct bitmaps.", file=sys.stderr)
+
+def write_json(path: str, payload: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--books-dir", default=os.path.join(ROOT, "all_books"), help="Directory of <lang>.json files")
+    ap.add_argument("--names", default=os.path.join(ROOT, "booksnames.json"), help="Path to booksnames.json")
+    ap.add_argument("--out", default=os.path.join(ROOT, "metadata_index.json"), help="Output path")
+    ap.add_argument("--availability", default=os.path.join(ROOT, "verse_availability.json"),
+                    help="Verse availability bitmaps output path")
+    args = ap.parse_args()
+    build(args.books_dir, args.names, args.out, args.availability)
+
+if __name__ == "__main__":
+    main()
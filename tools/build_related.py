@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Builds "verses like this one" tables for each language from all_books/*.json.
+
+Every verse becomes a TF-IDF vector over its words plus the character
+trigrams of those words (trigrams catch inflections and, for scripts written
+without spaces, most of the signal). Rows are L2-normalized, so cosine
+similarity is a sparse matrix product; we multiply one batch of verses
+against the whole language at a time and keep the top-k neighbours per verse.
+
+Verse ids are "<book>/<chapter>/<verse number>" with the number normalized
+(native digits, "12.", Ethiopic numerals), so tables of different languages
+line up and the server can pool them (/api/related?...&pool=eng,por).
+
+Output (one file per language):
+  derived/related/<lang>.json
+  {
+    "lang": "eng", "k": 10,
+    "ids": ["1-ne/1/1", ...],
+    "neighbors": [[[<id idx>, <cosine x 1000>], ...], ...]    # parallel to "ids", best first
+  }
+
+Usage:
+  python tools/build_related.py --langs eng,por,spa
+  python tools/build_related.py --langs all --topk 20 --batch 1024
+"""
+
+import argparse, json, os, sys, time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from build_alignment import BOOK_SLUGS, ROOT, tokenize, write_json
+from build_metadata_index import verse_number
+
+# ---------- helpers ----------
+
+def load_verses(lang: str) -> Tuple[List[str], List[str]]:
+    """(ids, texts) for every non-empty numbered verse, in canonical order."""
+    path = os.path.join(ROOT, "all_books", f"{lang}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    ids, texts = [], []
+    for slug in BOOK_SLUGS:
+        chapters = data.get(slug, {}).get("chapters", {})
+        for ch in sorted(chapters, key=lambda c: int(c) if c.isdigit() else 0):
+            numbered = []
+            for key, text in chapters[ch].items():
+                n = verse_number(key) if key != "intro" else None
+                if n and text:
+                    numbered.append((n, text))
+            for n, text in sorted(numbered):
+                ids.append(f"{slug}/{ch}/{n}")
+                texts.append(text)
+    return ids, texts
+
+def features(text: str) -> List[str]:
+    """Words plus the character trigrams of each word (with boundary markers)."""
+    out = []
+    for word in tokenize(text):
+        out.append(word)
+        padded = f" {word} "
+        out.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return out
+
+def tfidf_matrix(texts: List[str], min_df: int) -> sparse.csr_matrix:
+    """Sublinear-tf TF-IDF, rows L2-normalized."""
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    vals: List[float] = []
+    for i, text in enumerate(texts):
+        counts: Dict[int, int] = {}
+        for feat in features(text):
+            j = vocab.setdefault(feat, len(vocab))
+            counts[j] = counts.get(j, 0) + 1
+        rows.extend([i] * len(counts))
+        cols.extend(counts.keys())
+        vals.extend(counts.values())
+    tf = sparse.csr_matrix((np.array(vals, dtype=np.float32), (rows, cols)), shape=(len(texts), len(vocab)))
+    tf.data = 1.0 + np.log(tf.data)
+
+    df = np.bincount(tf.indices, minlength=tf.shape[1])
+    idf = (np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0).astype(np.float32)
+    idf[df < min_df] = 0.0   # hapax features only add noise (and size)
+    x = (tf @ sparse.diags(idf)).tocsr()
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sparse.diags(1.0 / norms) @ x).tocsr().astype(np.float32)
+
+def top_neighbors(x: sparse.csr_matrix, k: int, batch: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(indices, scores), each n x k: best k other verses per verse by cosine similarity."""
+    n = x.shape[0]
+    k = min(k, n - 1)
+    xt = x.T.tocsc()
+    idx = np.zeros((n, k), dtype=np.int32)
+    score = np.zeros((n, k), dtype=np.float32)
+    for start in range(0, n, batch):
+        stop = min(start + batch, n)
+        sims = (x[start:stop] @ xt).toarray()
+        sims[np.arange(stop - start), np.arange(start, stop)] = -1.0   # never your own neighbour
+        part = np.argpartition(-sims, k, axis=1)[:, :k]
+        part_scores = np.take_along_axis(sims, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        idx[start:stop] = np.take_along_axis(part, order, axis=1)
+        score[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+    return idx, score
+
+# ---------- pipeline ----------
+
+def build_lang(lang: str, out_dir: str, k: int, batch: int, min_df: int) -> None:
+    started = time.time()
+    ids, texts = load_verses(lang)
+    if len(ids) < 2:
+        print(f"[skip] {lang}: {len(ids)} verses", file=sys.stderr)
+        return
+    x = tfidf_matrix(texts, min_df)
+    idx, score = top_neighbors(x, k, batch)
+    scaled = np.rint(np.clip(score, 0, 1) * 1000).astype(int)
+    neighbors = [[[int(j), int(s)] for j, s in zip(row_i, row_s) if s > 0]
+                 for row_i, row_s in zip(idx.tolist(), scaled.tolist())]
+    write_json(os.path.join(out_dir, f"{lang}.json"),
+               {"lang": lang, "k": idx.shape[1], "ids": ids, "neighbors": neighbors})
+    print(f"{lang}: {len(ids)} verses, {x.shape[1]} features, {x.nnz} nonzeros "
+          f"in {time.time() - started:.1f}s", file=sys.stderr)
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--langs", required=True, help="Comma-separated languages (e.g., eng,por) or 'all'")
+    ap.add_argument("--out-dir", default=os.path.join(ROOT, "derived", "related"), help="Output directory")
+    ap.add_argument("--topk", type=int, default=10, help="Neighbours kept per verse (default: 10)")
+    ap.add_argument("--batch", type=int, default=512, help="Verses per similarity batch (default: 512)")
+    ap.add_argument("--min-df", type=int, default=2, help="Drop features seen in fewer verses (default: 2)")
+    args = ap.parse_args()
+
+    if args.langs == "all":
+        langs = sorted(os.path.splitext(n)[0] for n in os.listdir(os.path.join(ROOT, "all_books"))
+                       if n.endswith(".json"))
+    else:
+        langs = [l.strip() for l in args.langs.split(",") if l.strip()]
+    if not langs:
+        raise SystemExit("No languages given.")
+    for lang in langs:
+        build_lang(lang, args.out_dir, args.topk, args.batch, args.min_df)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Aggregates request profiles written by server.py (PROFILE_DIR) into a flame
+graph, and mints the signed header that triggers profiling.
+
+  *.collapsed  stack-sampler output ("a;b;c <count>" per line), merged as is
+  *.prof       cProfile/pstats output, converted to collapsed stacks by
+               splitting each function's time across its callers
+
+Usage:
+  SECRET_KEY=... python tools/flamegraph.py token
+      -> curl -H "X-Profile: <token>" "https://.../api/chapter?book=alma&chapter=32&lang=tha"
+  python tools/flamegraph.py render ./profiles --out flame.svg
+  python tools/flamegraph.py render ./profiles --match api_chapter --collapsed stacks.txt
+"""
+
+import argparse, glob, html, os, pstats, sys
+from typing import Dict, List, Tuple
+
+# ---------- helpers ----------
+
+def func_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name   # builtins, e.g. "<built-in method builtins.sorted>"
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def read_collapsed(path: str, stacks: Dict[str, float]) -> None:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stack, _, n = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] = stacks.get(stack, 0) + float(n)
+
+def read_pstats(path: str, stacks: Dict[str, float], max_depth: int = 64) -> None:
+    """Walks the call graph from the roots; weights are microseconds."""
+    st = pstats.Stats(path).stats   # func -> (cc, nc, tt, ct, callers{caller: (cc, nc, tt, ct)})
+    children: Dict[tuple, List[Tuple[tuple, float]]] = {}
+    roots = []
+    for func, (_cc, _nc, _tt, _ct, callers) in st.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    def walk(func, budget: float, path: List[str], on_path: set) -> None:
+        _cc, _nc, tt, ct, _callers = st[func]
+        if ct <= 0 or budget <= 0:
+            return
+        scale = min(1.0, budget / ct)
+        path.append(func_label(func))
+        key = ";".join(path)
+        stacks[key] = stacks.get(key, 0) + tt * scale * 1e6
+        if len(path) < max_depth:
+            for child, edge_ct in children.get(func, []):
+                if child not in on_path:
+                    on_path.add(child)
+                    walk(child, edge_ct * scale, path, on_path)
+                    on_path.discard(child)
+        path.pop()
+
+    for root in roots:
+        walk(root, st[root][3], [], {root})
+
+def load(directory: str, match: str) -> Tuple[Dict[str, float], int]:
+    stacks: Dict[str, float] = {}
+    n = 0
+    for path in sorted(glob.glob(os.path.join(directory, "*"))):
+        if match and match not in os.path.basename(path):
+            continue
+        if path.endswith(".collapsed"):
+            read_collapsed(path, stacks)
+        elif path.endswith(".prof"):
+            read_pstats(path, stacks)
+        else:
+            continue
+        n += 1
+    return stacks, n
+
+# ---------- SVG ----------
+
+def build_tree(stacks: Dict[str, float]) -> dict:
+    root = {"name": "all", "value": 0.0, "children": {}}
+    for stack, value in stacks.items():
+        root["value"] += value
+        node = root
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"name": frame, "value": 0.0, "children": {}})
+            node["value"] += value
+    return root
+
+def render_svg(stacks: Dict[str, float], title: str, width: int = 1200, row: int = 17) -> str:
+    tree = build_tree(stacks)
+    total = tree["value"] or 1.0
+    rects: List[str] = []
+    depth_max = [0]
+
+    def place(node, x: float, depth: int) -> None:
+        w = node["value"] / total * width
+        if w < 0.3:
+            return
+        depth_max[0] = max(depth_max[0], depth)
+        rects.append((x, depth, w, node["name"], node["value"] / total))
+        cx = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            place(child, cx, depth + 1)
+            cx += child["value"] / total * width
+
+    place(tree, 0.0, 0)
+    height = (depth_max[0] + 1) * row + 40
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">',
+        f'<text x="{width / 2}" y="20" text-anchor="middle" font-size="15">{html.escape(title)}</text>',
+    ]
+    for x, depth, w, name, share in rects:
+        y = height - (depth + 1) * row   # flame graph: root at the bottom
+        hue = 10 + (hash(name) % 40)
+        label = html.escape(name)
+        out.append(
+            f'<g><title>{label} ({share:.2%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="hsl({hue},85%,60%)"/>'
+        )
+        chars = int(w / 7)
+        if chars >= 3:
+            text = name if len(name) <= chars else name[:chars - 2] + ".."
+            out.append(f'<text x="{x + 3:.1f}" y="{y + row - 5}">{html.escape(text)}</text>')
+        out.append("</g>")
+    out.append("</svg>")
+    return "\n".join(out)
+
+# ---------- CLI ----------
+
+def cmd_token(args) -> None:
+    from itsdangerous import URLSafeTimedSerializer
+    secret = os.environ.get("SECRET_KEY", "dev-change-me")
+    print(URLSafeTimedSerializer(secret, salt="profile").dumps({"op": "profile"}))
+
+def cmd_render(args) -> None:
+    stacks, n = load(args.directory, args.match)
+    if not stacks:
+        raise SystemExit(f"No .prof/.collapsed files found in {args.directory}")
+    if args.collapsed:
+        with open(args.collapsed, "w", encoding="utf-8") as f:
+            for stack, value in sorted(stacks.items()):
+                f.write(f"{stack} {int(round(value))}\n")
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(render_svg(stacks, args.title or f"{n} profiles from {args.directory}"))
+    print(f"Wrote {args.out} from {n} profiles ({len(stacks)} distinct stacks).", file=sys.stderr)
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("token", help="Print an X-Profile header value (uses $SECRET_KEY)")
+    r = sub.add_parser("render", help="Aggregate profiles into a flame graph SVG")
+    r.add_argument("directory", help="PROFILE_DIR with .prof / .collapsed files")
+    r.add_argument("--out", default="flame.svg", help="SVG output path (default: flame.svg)")
+    r.add_argument("--collapsed", default="", help="Also write merged collapsed stacks (flamegraph.pl/speedscope)")
+    r.add_argument("--match", default="", help="Only files whose name contains this (e.g., api_chapter)")
+    r.add_argument("--title", default="", help="Graph title")
+    args = ap.parse_args()
+    cmd_token(args) if args.cmd == "token" else cmd_render(args)
+
+if __name__ == "__main__":
+    main()
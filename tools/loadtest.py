@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Small HTTP load generator for comparing serving profiles.
+
+Synthetic mode drives a running server with a reading mix: chapter pairs
+across a set of languages (the first fetch of each language is a cold file
+load), plus /api/books and /api/intro, from N concurrent clients.
+
+Replay mode re-issues the GET requests recorded by the server's access log
+(ACCESS_LOG_PATH, JSONL) with their original spacing divided by --speedup.
+
+Both print throughput, latency percentiles and error counts.
+
+Usage:
+  python tools/loadtest.py --base-url http://127.0.0.1:5050 --concurrency 16 --seconds 20
+  python tools/loadtest.py --langs eng,por,spa,fra,deu --slow-every 50
+  python tools/loadtest.py --replay instance/requests.jsonl --speedup 20 --concurrency 32
+"""
+
+import argparse, json, random, sys, threading, time, urllib.error, urllib.parse, urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+BOOK_CHAPTERS = {
+    "1-ne": 22, "2-ne": 33, "jacob": 7, "enos": 1, "jarom": 1, "omni": 1,
+    "w-of-m": 1, "mosiah": 29, "alma": 63, "hel": 16, "3-ne": 30, "4-ne": 1,
+    "morm": 9, "ether": 15, "moro": 10,
+}
+
+# ---------- helpers ----------
+
+def percentile(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * p))]
+
+def fetch(base_url: str, path: str, timeout: float, data: Optional[bytes] = None) -> Tuple[int, int, float]:
+    """(status, bytes, seconds); status 0 means a connection error or timeout."""
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(base_url + path, data=data, timeout=timeout) as r:
+            n = len(r.read())
+            return r.status, n, time.perf_counter() - t0
+    except urllib.error.HTTPError as e:
+        return e.code, len(e.read() or b""), time.perf_counter() - t0
+    except Exception:
+        return 0, 0, time.perf_counter() - t0
+
+def reading_mix(rnd: random.Random, langs: List[str]) -> List[str]:
+    """One "page view": both columns of a chapter, sometimes the books list / intro."""
+    main, second = rnd.sample(langs, 2) if len(langs) > 1 else (langs[0], langs[0])
+    book = rnd.choice(list(BOOK_CHAPTERS))
+    ch = rnd.randint(1, BOOK_CHAPTERS[book])
+    paths = [f"/api/chapter?book={book}&chapter={ch}&lang={l}" for l in (main, second)]
+    if rnd.random() < 0.2:
+        paths.append(f"/api/books?lang={main}")
+    if rnd.random() < 0.05:
+        paths.append(f"/api/intro?book=1-ne&chapter=1&lang={main}")
+    return paths
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.lat: List[float] = []
+        self.bytes = 0
+        self.errors = {}
+        self.routes = {}   # route -> [latencies]
+        self.late: List[float] = []   # replay: how far behind schedule requests started
+
+    def add(self, status: int, n: int, secs: float, route: str = "") -> None:
+        with self.lock:
+            self.lat.append(secs)
+            self.bytes += n
+            if route:
+                self.routes.setdefault(route, []).append(secs)
+            if status == 0 or status >= 500:
+                self.errors[status] = self.errors.get(status, 0) + 1
+
+    def report(self, label: str, wall: float) -> None:
+        lat = sorted(self.lat)
+        n = len(lat)
+        errs = sum(self.errors.values())
+        print(f"{label}: {n} requests in {wall:.1f}s = {n / wall:.1f} req/s, "
+              f"{self.bytes / wall / 1e6:.1f} MB/s")
+        print(f"  latency ms  p50 {percentile(lat, .5) * 1000:.1f}  p90 {percentile(lat, .9) * 1000:.1f}  "
+              f"p99 {percentile(lat, .99) * 1000:.1f}  max {(lat[-1] if lat else 0) * 1000:.1f}")
+        print(f"  errors {errs} ({errs / max(1, n):.2%})" + (f" by status {self.errors}" if errs else ""))
+        for route, vals in sorted(self.routes.items(), key=lambda kv: -len(kv[1])):
+            vals.sort()
+            print(f"  {route:24s} {len(vals):7d}  p50 {percentile(vals, .5) * 1000:7.1f}  "
+                  f"p99 {percentile(vals, .99) * 1000:7.1f} ms")
+        if self.late:
+            late = sorted(self.late)
+            print(f"  schedule lag ms  p50 {percentile(late, .5) * 1000:.1f}  p99 {percentile(late, .99) * 1000:.1f} "
+                  f"(high lag = client concurrency is the bottleneck)")
+
+# ---------- pipeline ----------
+
+def run_synthetic(args) -> None:
+    langs = [l.strip() for l in args.langs.split(",") if l.strip()]
+    stats = Stats()
+    deadline = time.perf_counter() + args.seconds
+    counter = [0]
+
+    def client(seed: int) -> None:
+        rnd = random.Random(seed)
+        while time.perf_counter() < deadline:
+            paths = reading_mix(rnd, langs)
+            with stats.lock:
+                counter[0] += 1
+                slow = args.slow_every and counter[0] % args.slow_every == 0
+            if slow:
+                # a failed login still runs the PBKDF2 check if the account exists
+                body = f"email={args.slow_email}&password=wrong-password".encode()
+                stats.add(*fetch(args.base_url, "/login", args.timeout, data=body))
+            for path in paths:
+                stats.add(*fetch(args.base_url, path, args.timeout))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i in range(args.concurrency):
+            pool.submit(client, args.seed + i)
+    stats.report(args.label, time.perf_counter() - started)
+
+def load_replay(path: str) -> List[Tuple[float, str, str]]:
+    """(ts, route, path_with_query) for recorded GETs, oldest first."""
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("method", "GET") != "GET" or not rec.get("route"):
+                continue   # bodies aren't recorded, so POSTs can't be replayed
+            query = urllib.parse.urlencode(rec.get("params") or {})
+            out.append((float(rec["ts"]), rec["route"], rec["route"] + (f"?{query}" if query else "")))
+    out.sort(key=lambda r: r[0])
+    return out
+
+def run_replay(args) -> None:
+    records = load_replay(args.replay)
+    if not records:
+        raise SystemExit(f"No replayable GET requests in {args.replay}")
+    stats = Stats()
+    t_first = records[0][0]
+
+    def one(route: str, path: str, due: float) -> None:
+        with stats.lock:
+            stats.late.append(max(0.0, time.perf_counter() - due))
+        status, n, secs = fetch(args.base_url, path, args.timeout)
+        stats.add(status, n, secs, route)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for ts, route, path in records:
+            due = started + (ts - t_first) / args.speedup
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(one, route, path, due)
+    span = (records[-1][0] - t_first) / args.speedup
+    print(f"replayed {len(records)} requests spanning {span:.1f}s at {args.speedup:g}x", file=sys.stderr)
+    stats.report(args.label, time.perf_counter() - started)
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default="http://127.0.0.1:5050", help="Server to drive")
+    ap.add_argument("--concurrency", type=int, default=16, help="Concurrent clients (default: 16)")
+    ap.add_argument("--seconds", type=float, default=20, help="Test duration (default: 20)")
+    ap.add_argument("--timeout", type=float, default=30, help="Per-request timeout seconds (default: 30)")
+    ap.add_argument("--langs", default="eng,por,spa,fra,deu,ita,rus,jpn,kor,zho",
+                    help="Languages to read in (comma-separated)")
+    ap.add_argument("--slow-every", type=int, default=0,
+                    help="Every Nth page view also POSTs a failing /login (PBKDF2-bound); 0 disables")
+    ap.add_argument("--slow-email", default="loadtest@example.com", help="Existing account for --slow-every")
+    ap.add_argument("--replay", default="", help="Replay a JSONL access log (ACCESS_LOG_PATH) instead")
+    ap.add_argument("--speedup", type=float, default=1.0, help="Replay speed-up factor (default: 1)")
+    ap.add_argument("--seed", type=int, default=1, help="Random seed")
+    ap.add_argument("--label", default="result", help="Label for the report")
+    args = ap.parse_args()
+    run_replay(args) if args.replay else run_synthetic(args)
+
+if __name__ == "__main__":
+    main()
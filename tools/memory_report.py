@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Reports how much RAM the corpus caches cost, per language.
+
+Loads the requested languages through the server's own loader (so sharing of
+identical files and string interning are reflected), then prints deep size,
+incremental size (what the language adds on top of those already loaded),
+str object bytes versus raw UTF-8, and container (dict/list) overhead.
+Optionally traces a cold load of one language with tracemalloc.
+
+The same report is served to admins at /api/admin/memory for a live worker.
+
+Usage:
+  python tools/memory_report.py --langs eng,por,tha,kat
+  python tools/memory_report.py --langs all --trace kat --json
+"""
+
+import argparse, json, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def mb(n: int) -> str:
+    return f"{n / (1024 * 1024):8.2f}"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--langs", default="eng", help="Comma-separated languages to load, or 'all'")
+    ap.add_argument("--trace", default="", help="Also trace a cold load of this language with tracemalloc")
+    ap.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = ap.parse_args()
+
+    import server  # noqa: E402  (needs ROOT on sys.path)
+
+    if args.langs == "all":
+        langs = sorted(os.path.splitext(n)[0] for n in os.listdir(os.path.join(ROOT, "all_books"))
+                       if n.endswith(".json"))
+    else:
+        langs = [l.strip() for l in args.langs.split(",") if l.strip()]
+    # Trace first: once a language is cached, interning would reuse its strings.
+    cold = server._trace_cold_load(args.trace) if args.trace else None
+    for lang in langs:
+        server._load_book_data(lang)
+        server._get_books_for_lang(lang)
+
+    report = server._memory_report()
+    if cold:
+        report["cold_load"] = cold
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{'lang':10s} {'deep MB':>8s} {'incr MB':>8s} {'utf8 MB':>8s} {'str MB':>8s} {'dict MB':>8s} "
+          f"{'x utf8':>7s} {'strings':>8s}  digest")
+    for lang, r in sorted(report["languages"].items(), key=lambda kv: -kv[1]["deep_bytes"]):
+        print(f"{lang:10s} {mb(r['deep_bytes'])} {mb(r['incremental_bytes'])} {mb(r['utf8_bytes'])} "
+              f"{mb(r['str_object_bytes'])} {mb(r['container_bytes'])} {r['overhead_ratio'] or 0:7.2f} "
+              f"{r['strings']:8d}  {r['digest']}")
+    print(f"{'total':10s} {'':8s} {mb(report['corpus_total_bytes'])}")
+    print()
+    for name, c in report["caches"].items():
+        print(f"{name:16s} {c['entries']:6d} entries {mb(c['deep_bytes'])} MB")
+    cold = report.get("cold_load")
+    if cold:
+        print(f"\ncold load of {cold['lang']}: {cold['file_bytes'] / 1e6:.2f} MB file, {cold['seconds']:.3f}s, "
+              f"peak traced {cold['peak_traced_bytes'] / 1e6:.1f} MB")
+        for t in cold["top"]:
+            print(f"  {t['size_diff'] / 1e6:8.2f} MB {t['count_diff']:8d} blocks  {t['where']}")
+
+if __name__ == "__main__":
+    main()